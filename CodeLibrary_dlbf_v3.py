@@ -0,0 +1,2962 @@
+
+"""Created on the 05.Dec.2024
+@author: Dhan Lord B. Fortela
+@author contact: dhanlord.fortela@louisiana.edu
+
+API for accessing AspenPlus RadFrac module to perform SAC RL
+If you change it, update it, fix something just email me such that I can also update my version to keep it as coherent as possible
+
+Note that that functions currently contained in this module are those for the RadFrac column module in AspenPlus.
+
+Both studies (Experiments/FixedColumnDiameter and Experiments/VariableColumnDiameter) use this one module, install it with
+"pip install -e ." from the repository root. The fixed-diameter study freezes the column diameters with DesignConfiguration.
+
+Refrence:
+These codes are based on the prior work of: Richard ten Hagen; email: Richardxtenxhagen@gmail.com; GitHub: https://github.com/YouMayCallMeJesus/AspenPlus-Python-Interface. This prior work demonstrated example codes for AspenPlus-Python Interacing using the Python package win32com.
+
+"""
+
+# Import required packages:
+from fileinput import filename
+import os
+from re import A
+from tokenize import String
+from typing import Union, Dict, Literal
+try:
+    import win32com.client as win32
+except ImportError:     # No Windows/pywin32: only Aspen documents passed in as AspenDocument can be used
+    win32 = None
+try:
+    import pythoncom    # Part of pywin32, needed to use COM from worker threads
+except ImportError:
+    pythoncom = None
+try:
+    import psutil
+except ImportError:     # Optional, only used by EngineSupervisor to watch memory
+    psutil = None
+import numpy as np
+import time
+import hashlib
+import json
+import threading
+import math
+import queue
+import selectors
+import socket
+import struct
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Column internals input variables (the Action vars) addressed by this API. Keys are the names used in the
+# dictionaries of BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK / BLK_RADFRAC_SET_ALL_INPUTS, values are (Input node, section).
+RADFRAC_INTERNALS_INPUTS = {
+    "ColDiam_Top": ("CA_DIAM", "TOP"),
+    "TraySpace_Top": ("CA_TRAY_SPC", "TOP"),
+    "WeirHeight_Top": ("CA_WEIR_HT", "TOP"),
+    "DowncomerClearance_Top": ("CA_DC_CLEAR", "TOP"),
+    "WeirLengthSide_Top": ("CA_WEIRLN_SD", "TOP"),
+    "HoleDiam_Top": ("CA_HOLE_DIAM", "TOP"),
+    "ColDiam_Bot": ("CA_DIAM", "BOT"),
+    "TraySpace_Bot": ("CA_TRAY_SPC", "BOT"),
+    "WeirHeight_Bot": ("CA_WEIR_HT", "BOT"),
+    "DowncomerClearance_Bot": ("CA_DC_CLEAR", "BOT"),
+    "WeirLengthSide_Bot": ("CA_WEIRLN_SD", "BOT"),
+    "HoleDiam_Bot": ("CA_HOLE_DIAM", "BOT"),
+}
+
+# Typical magnitude of each internals input (the values of the column archive), the default scale of FailureMap
+RADFRAC_INTERNALS_SCALE = {
+    "ColDiam_Top": 1.5, "TraySpace_Top": 0.6096, "WeirHeight_Top": 0.0508,
+    "DowncomerClearance_Top": 0.0381, "WeirLengthSide_Top": 0.05, "HoleDiam_Top": 0.0127,
+    "ColDiam_Bot": 1.5, "TraySpace_Bot": 0.6096, "WeirHeight_Bot": 0.0508,
+    "DowncomerClearance_Bot": 0.0381, "WeirLengthSide_Bot": 0.05, "HoleDiam_Bot": 0.0127,
+}
+
+def DesignToVector(Dictionary: Dict[str, Union[str,float,int]]) -> np.ndarray:
+    """Packs a design Dictionary (names of RADFRAC_INTERNALS_INPUTS) into a float vector, NaN where not given"""
+    return np.array([np.nan if Dictionary.get(Name) is None else float(Dictionary[Name]) for Name in RADFRAC_INTERNALS_INPUTS])
+
+def VectorToDesign(Vector) -> Dict[str, float]:
+    """Unpacks a float vector in RADFRAC_INTERNALS_INPUTS order into a design Dictionary, NaN entries are left out"""
+    return {Name: float(Value) for Name, Value in zip(RADFRAC_INTERNALS_INPUTS, Vector) if not math.isnan(Value)}
+
+# Per-stage column internals outputs (the State vars come from CA_FLD_FAC8 = % approach to flooding)
+RADFRAC_INTERNALS_OUTPUTS = ("CA_FLD_FAC8",)
+
+# Block Input nodes (paths relative to Input, "/"-separated) written for each evaluation fidelity. "high" is the
+# full solve and restores the values of the archive; "low" is a screening run with a reduced outside-loop iteration
+# cap (MAXOL) and a looser outside-loop tolerance (TOLOL). The internals are rated for the given geometry in both.
+RADFRAC_FIDELITY_INPUTS = {
+    "low": {"MAXOL": 10, "TOLOL": 1e-3},
+    "high": {},
+}
+
+
+
+# Set of funcitons for the AspenPlus simulation called withon Python:
+
+class Simulation():
+    """Class which starts a Simulation interface instance
+    
+    Args:
+        AspenFileName: Name of the Aspenfile on which you are working with
+        WorkingDirectoryPath: Path to the Folder where we will be working
+        VISIBITLITY: Toggles the opening and interactive running of the Aspen simulation
+        ChangeDirectory: If False the process working directory is left untouched and AspenFileName is taken
+            relative to WorkingDirectoryPath, so that several simulations can coexist in one process
+        AspenDocument: Already created Aspen document to use instead of dispatching a new "Apwn.Document"
+        QUIET: Suppresses the progress prints (e.g. the runtime of every run), use Metrics to follow long runs
+        Metrics: Optional SimulationMetrics which collects run times, retries, convergence and cache hits
+    """
+
+    def __init__(self, AspenFileName:str, WorkingDirectoryPath:str, VISIBILITY:bool = True, ChangeDirectory:bool = True, AspenDocument = None,
+                 QUIET:bool = False, Metrics: "SimulationMetrics" = None):
+        self.QUIET = QUIET
+        self.Metrics = Metrics
+        if ChangeDirectory:
+            self._Print("The current Directory is :  ")
+            self._Print(os.getcwd())                #Returns the Directory where it is currently working
+            os.chdir(WorkingDirectoryPath)          #Changes the Directory to  ..../AspenSimulation
+            self._Print("The new Directory where you should also have your Aspen file is : ")
+            self._Print(os.getcwd())          
+            self.AspenFilePath = os.path.abspath(AspenFileName)
+        else:
+            self.AspenFilePath = os.path.abspath(os.path.join(WorkingDirectoryPath, AspenFileName))
+        #AspenSimulation = win32.gencache.EnsureDispatch("Apwn.Document") # this seems like the old syntax
+        self.EngineProcessIds = set()           #Aspen processes started for this document, see AspenEngineMemoryMB()
+        if AspenDocument is None:
+            with _EngineStartLock:              #One engine start at a time, so the new Aspen processes are this document's
+                Before = _AspenProcessIds()
+                self.AspenSimulation = win32.Dispatch("Apwn.Document") # this initializes the connection of Python with Windows and ApsenPlus application
+                self.AspenSimulation.InitFromArchive2(self.AspenFilePath)
+                self.EngineProcessIds = _AspenProcessIds() - Before
+        else:
+            self.AspenSimulation = AspenDocument    # One document per Simulation instance, not shared by the class
+            self.AspenSimulation.InitFromArchive2(self.AspenFilePath)
+        self.TreeIndex = None                   #Optional AspenTreeIndex, see LoadTreeIndex()
+        self.BaselineInputs = {}                #Blockname -> internals inputs restored by Reset()
+        self.RunGeneration = 0                  #Counts Run() calls
+        self.InputGeneration = 0                #Counts input changes made through this API
+        self.SnapshotBlocks = {}                #Blockname -> output variables captured by Run(), see RegisterSnapshotBlock()
+        self.OutputSnapshot = None              #OutputSnapshot of the last Run(), None if stale or not captured
+        self.Fidelity = {}                      #Blockname -> current evaluation fidelity, see SetFidelity()
+        self.FidelityBaseline = {}              #(Blockname, input path) -> archive value restored by "high"
+        self._Print("The Aspen is active now. If you dont want to see aspen open again take VISIBITLY as False \n")
+        self.AspenSimulation.Visible = VISIBILITY
+
+    def _Print(self, *Args) -> None:
+        if not self.QUIET:
+            print(*Args)
+
+    def Run(self, Snapshot: bool = True) -> bool:
+        """Runs simulation, if there is a problem it will rerun twice, returns boolean about successful convergence
+
+        Args:
+            Snapshot: If True and Blocks are registered with RegisterSnapshotBlock(), their outputs are read once
+                into an OutputSnapshot which then serves the output getters until the next input change or run
+        """
+        tries = 0
+        converged = 0
+        self.RunGeneration += 1
+        self.OutputSnapshot = None
+        #iterations = 10
+        #self.BLK.Elements("B1").Elements("Input").Elements("MAXOL").Value = iterations
+
+        while tries != 2:
+            start = time.time()
+            self.AspenSimulation.Engine.Run2()
+            RunTime = time.time() - start
+            self._Print(f"Runtime = {RunTime}")
+            # print(time.time() - start)
+            converged = self.AspenSimulation.Tree.Elements("Data").Elements("Results Summary").Elements(
+                           "Run-Status").Elements("Output").Elements("PER_ERROR").Value
+            if self.Metrics is not None:
+                self.Metrics.Observe("aspen_run_attempt_seconds", RunTime)
+                self.Metrics.Inc("aspen_run_attempts_total")
+                if tries:
+                    self.Metrics.Inc("aspen_run_retries_total")
+            if converged == 0:
+                converged = True
+                break
+            elif converged == 1:
+                tries += 1
+                converged = False
+        if self.Metrics is not None:
+            self.Metrics.Inc("aspen_runs_total")
+            self.Metrics.Inc("aspen_runs_converged_total" if converged else "aspen_runs_failed_total")
+        if Snapshot and self.SnapshotBlocks:
+            self.CaptureOutputSnapshot(converged)
+        return converged
+    
+    
+    
+    
+    def CloseAspen(self):
+        AspenFileName = self.Give_AspenDocumentName()
+        self._Print(AspenFileName)
+        self.AspenSimulation.Close(os.path.abspath(AspenFileName))
+        self._Print("\nAspen should be closed now")
+
+    #This just shortens the path you need to call for Streams and Blocks:
+    @property
+    def BLK(self):
+        """Property: Defines Path to the Block node in Aspen File system. 
+            
+        Aspendocument is defined in the Class Simulation initialization
+        """
+        return self.AspenSimulation.Tree.Elements("Data").Elements("Blocks") 
+
+    @property
+    def STRM(self):
+        """Property: Defines Path to the Streamnode node in Aspen File system. 
+            
+        Aspendocument is defined in the Class Simulation initialization
+        """
+        return self.AspenSimulation.Tree.Elements("Data").Elements("Streams")
+
+
+
+    #Type definition to simplify the type hinting:
+    Phnum = Literal[1,2,3]
+    Ph = Literal["L", "V", "S"]
+
+
+
+
+
+    def VisibilityChange(self,VISIBILITY: bool) -> None:
+        """ De/Activates Aspensheet graphics from being rendered. 
+        
+        Args:
+            Visibility: String "FALSE" for more speed or "TRUE" for manual usage of Aspen
+        """
+        self.AspenSimulation.Visible = VISIBILITY
+    
+    def SheetCheckIfInputsAreComplete(self) -> bool:
+        """Check if all Inputs are given on the entire Sheet, returns "0x00002081 = HAP_RESULTS_SUCCESS|HAP_INPUT_COMPLETE|HAP_ENABLED"
+        
+        Checks if the Aspen Expert system thinks all necessary Inputs are given and the Simulation can be run
+        
+        Args:
+            Blockname: String which contains the Name of the Block in Aspen
+            return: TRUE or FALSE????????????
+        """
+        return self.AspenSimulation.COMPSTATUS
+
+    def BlockCheckIfInputsAreComplete(self, Blockname: str) -> bool:
+        """
+        Checks if the Aspen Expert system thinks all necessary Inputs are given and the Simulation can be run
+        
+        Args:
+            Blockname: String which contains the Name of the Block in Aspen
+            return: TRUE or FALSE????????????
+        """
+        return self.BLK.Elements(Blockname).COMPSTATUS
+
+    def StreamCheckIfInputsAreComplete(self, Streamname:str) -> bool:
+        """
+        Checks if the Aspen Expert system thinks all necessary Inputs are given and the Simulation can be run
+        
+        Args:
+            Streamname: String which contains the Name of the Block in Aspen
+            return: TRUE or FALSE????????????
+        """
+        return self.STRM.Elements(Streamname).COMPSTATUS
+
+
+    def Give_AspenDocumentName(self) -> String:
+        """Returns name of Aspen document"""
+        return self.AspenSimulation.FullName
+
+    def DialogSuppression(self, TrueOrFalse: bool) -> None:
+        """Supresses Aspen Popups
+        
+        Args: 
+            TrueOrFalse: can be True or False """
+        self.AspenSimulation.SuppressDialogs = TrueOrFalse
+        
+    def EngineRun(self) -> None:
+        """Runs Simulation, synonymous with pressing the playbutton"""
+        self.RunGeneration += 1
+        self.OutputSnapshot = None
+        self.AspenSimulation.Run2()
+        
+    def EngineStop(self) -> None:
+        """Stops Simulation, synonymous to pressing the red square button"""
+        self.AspenSimulation.Stop()
+        
+    def EngineReinit(self) -> None:
+        """Reinitalizes the Entire Simulation, synonymous to pressing the Reset button
+
+        Other possible functions you might need are: BlockReinit(Blockname), StreamReinit(Streamname)
+        """
+        self.AspenSimulation.Reinit()
+        self.RunGeneration += 1
+        self.OutputSnapshot = None
+    
+    def Save(self) -> None:
+        """Saves Current Simulation (.apw), Inputs and all Values connected to it."""
+        self.AspenSimulation.Save()
+
+    def CaptureBaselineInputs(self, Blockname: str) -> Dict[str, Union[str,float,int]]:
+        """Stores the current internals inputs of a Block as the baseline that Reset() restores
+
+        Args:
+            Blockname: String which gives the name of Block.
+        """
+        self.BaselineInputs[Blockname] = self.BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK(Blockname)
+        return self.BaselineInputs[Blockname]
+
+    def Reset(self) -> None:
+        """Brings the loaded document back to its baseline for a new experiment without reloading the archive
+
+        Restores the inputs captured with CaptureBaselineInputs() and reinitializes the simulation results.
+        """
+        for Blockname, Dictionary in self.BaselineInputs.items():
+            self.BLK_RADFRAC_SET_ALL_INPUTS(Blockname, Dictionary)
+        for Blockname in list(self.Fidelity):
+            self.SetFidelity(Blockname, "high")
+        self.EngineReinit()
+
+    def LoadTreeIndex(self, Blocknames, CacheDirectory: str = None) -> "AspenTreeIndex":
+        """Loads the cached index of the Aspen variable tree for this archive, building it once if missing.
+
+        Once loaded, stage names and sections are taken from the index instead of walking the COM tree.
+
+        Args:
+            Blocknames: List of RadFrac Block names to be indexed
+            CacheDirectory: Folder of the index files, defaults to ".aspen_tree_index" next to the Aspen file
+        """
+        self.TreeIndex = AspenTreeIndex.LoadOrBuild(self, self.AspenFilePath, Blocknames, CacheDirectory)
+        return self.TreeIndex
+
+    def _InternalsInputNode(self, Blockname: str, Variable: str, Section: str, Internals: str = "INT-1"):
+        """Returns the COM node of a column internals input, e.g. Variable "CA_DIAM" and Section "TOP" """
+        return self.BLK.Elements(Blockname).Elements("Input").Elements(Variable).Elements(Internals).Elements(Section)
+
+    def _SetInternalsInput(self, Blockname: str, Variable: str, Section: str, Value, Internals: str = "INT-1") -> None:
+        """Writes a column internals input, every input change made through this API invalidates the OutputSnapshot"""
+        self._InternalsInputNode(Blockname, Variable, Section, Internals).Value = Value
+        self.InputGeneration += 1
+        self.OutputSnapshot = None
+
+    def _SectionNames(self, Blockname: str, Variable: str = "CA_FLD_FAC8", Internals: str = "INT-1"):
+        """Returns the section names of a column internals, from the TreeIndex if available, else from the COM tree"""
+        if self.TreeIndex is not None:
+            SectionNames = self.TreeIndex.Sections(Blockname, Variable, Internals)
+            if SectionNames:
+                return SectionNames
+        InternalsNode = self.BLK.Elements(Blockname).Elements("Output").Elements(Variable).Elements(Internals)
+        return [section.Name for section in InternalsNode.Elements]
+
+    def _StageNames(self, Blockname: str, Section: str, Variable: str = "CA_FLD_FAC8", Internals: str = "INT-1"):
+        """Returns the stage names of a column section, from the TreeIndex if available, else from the COM tree"""
+        if self.TreeIndex is not None:
+            StageNames = self.TreeIndex.StageNames(Blockname, Section, Variable, Internals)
+            if StageNames:
+                return StageNames
+        SectionNode = self.BLK.Elements(Blockname).Elements("Output").Elements(Variable).Elements(Internals).Elements(Section)
+        return [stage.Name for stage in SectionNode.Elements]
+
+
+
+
+
+########################################################################################################################################
+
+
+###########         N               N       PPPPPPPPPPP         U               U       TTTTTTTTTTTTTTTTTTTTTTTT
+    #               N  N            N       P           P       U               U                   T
+    #               N    N          N       P           P       U               U                   T
+    #               N      N        N       P           P       U               U                   T
+    #               N       N       N       PPPPPPPPPPP         U               U                   T
+    #               N         N     N       P                   U               U                   T
+    #               N           N   N       P                   U               U                   T
+    #               N             N N       P                   U               U                   T
+###########         N               N       P                   UUUUUUUUUUUUUUUUU                   T
+
+
+############################################################################################################################################
+#    
+#
+#
+###################################################################################################################
+#####
+#############------- Read values of Action Var values from the AspenPlus file. -------##########
+#####
+###################################################################################################################
+
+    """
+    These are the functions used to GET (or read) the values of the Action variables (column internal design parameters). We read these values tp be inputs to the next training step of the SAC RL.
+
+    """
+    
+    # Get individual parameter states:
+    # Assuming only TOP and BOT sections exist
+    def BLK_RADFRAC_Get_TOP_DIAMETER(self, Blockname):
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_DIAM").Elements("INT-1").Elements("TOP").Value
+    def BLK_RADFRAC_Get_TOP_TRAYSPACING(self, Blockname):
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_TRAY_SPC").Elements("INT-1").Elements("TOP").Value
+    def BLK_RADFRAC_Get_TOP_WEIRHT(self, Blockname):        
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_WEIR_HT").Elements("INT-1").Elements("TOP").Value
+    def BLK_RADFRAC_Get_TOP_DC_CLEAR(self, Blockname):            
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_DC_CLEAR").Elements("INT-1").Elements("TOP").Value
+    def BLK_RADFRAC_Get_TOP_WEIR_SIDE_LN(self, Blockname):            
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_WEIRLN_SD").Elements("INT-1").Elements("TOP").Value
+    def BLK_RADFRAC_Get_TOP_WEIR_HT(self, Blockname):            
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_WEIR_HT").Elements("INT-1").Elements("TOP").Value
+    
+    # BOT
+    def BLK_RADFRAC_Get_BOT_DIAMETER(self, Blockname):
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_DIAM").Elements("INT-1").Elements("BOT").Value
+    def BLK_RADFRAC_Get_BOT_TRAYSPACING(self, Blockname):
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_TRAY_SPC").Elements("INT-1").Elements("BOT").Value
+    def BLK_RADFRAC_Get_BOT_WEIRHT(self, Blockname):        
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_WEIR_HT").Elements("INT-1").Elements("BOT").Value
+    def BLK_RADFRAC_Get_BOT_DC_CLEAR(self, Blockname):            
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_DC_CLEAR").Elements("INT-1").Elements("BOT").Value
+    def BLK_RADFRAC_Get_BOT_WEIR_SIDE_LN(self, Blockname):            
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_WEIRLN_SD").Elements("INT-1").Elements("BOT").Value
+    def BLK_RADFRAC_Get_TOP_WEIR_HT(self, Blockname):            
+        return self.BLK.Elements(Blockname).Elements("Input").Elements("CA_WEIR_HT").Elements("INT-1").Elements("BOT").Value
+
+#    
+#
+#
+###################################################################################################################
+#####
+#############------- Set the values of Action Var values into the AspenPlus file -------##########
+#####
+###################################################################################################################
+
+    """
+    These are the functions used to SET the values of the Action variables (column internal design parameters). Note that the assigned values are by default the read values from the initial setting in the AspenPlues model file. These values are updated by the SAC RL during leanring usigng the following functions .
+
+    """
+    
+    # Set RadFrac Column internals assuming we have TOP and BOT sections only
+    # TOP section
+    def BLK_RADFRAC_Set_TOP_DIAMETER(self, Blockname, ColDiam_Top):
+        self._SetInternalsInput(Blockname, "CA_DIAM", "TOP", ColDiam_Top)
+    def BLK_RADFRAC_Set_TOP_TRAYSPACING(self, Blockname, TraySpace_Top):
+        self._SetInternalsInput(Blockname, "CA_TRAY_SPC", "TOP", TraySpace_Top)
+    def BLK_RADFRAC_Set_TOP_DC_CLEAR(self, Blockname, DowncomerClearance_Top):            
+        self._SetInternalsInput(Blockname, "CA_DC_CLEAR", "TOP", DowncomerClearance_Top)
+    def BLK_RADFRAC_Set_TOP_WEIR_SIDE_LN(self, Blockname, WeirLengthSide_Top):            
+        self._SetInternalsInput(Blockname, "CA_WEIRLN_SD", "TOP", WeirLengthSide_Top)
+    def BLK_RADFRAC_Set_TOP_WEIR_HT(self, Blockname, WeirHeight_Top):            
+        self._SetInternalsInput(Blockname, "CA_WEIR_HT", "TOP", WeirHeight_Top)
+    def BLK_RADFRAC_Set_TOP_HOLE_DIAM(self, Blockname, HoleDiam_Top):            
+        self._SetInternalsInput(Blockname, "CA_HOLE_DIAM", "TOP", HoleDiam_Top)
+    
+    # BOT section 
+    def BLK_RADFRAC_Set_BOT_DIAMETER(self, Blockname, ColDiam_Bot):
+        self._SetInternalsInput(Blockname, "CA_DIAM", "BOT", ColDiam_Bot)
+    def BLK_RADFRAC_Set_BOT_TRAYSPACING(self, Blockname, TraySpace_Bot):
+        self._SetInternalsInput(Blockname, "CA_TRAY_SPC", "BOT", TraySpace_Bot)
+    def BLK_RADFRAC_Set_BOT_DC_CLEAR(self, Blockname, DowncomerClearance_Bot):            
+        self._SetInternalsInput(Blockname, "CA_DC_CLEAR", "BOT", DowncomerClearance_Bot)
+    def BLK_RADFRAC_Set_BOT_WEIR_SIDE_LN(self, Blockname, WeirLengthSide_Bot):            
+        self._SetInternalsInput(Blockname, "CA_WEIRLN_SD", "BOT", WeirLengthSide_Bot)
+    def BLK_RADFRAC_Set_BOT_WEIR_HT(self, Blockname, WeirHeight_Bot):            
+        self._SetInternalsInput(Blockname, "CA_WEIR_HT", "BOT", WeirHeight_Bot)
+    def BLK_RADFRAC_Set_BOT_HOLE_DIAM(self, Blockname, HoleDiam_Bot):            
+        self._SetInternalsInput(Blockname, "CA_HOLE_DIAM", "BOT", HoleDiam_Bot)
+
+
+
+#
+#
+###################################################################################################################
+#####
+#############------- Get ALL values of Action Var values from the AspenPlus file -------##########
+#####
+###################################################################################################################
+
+    """
+    This function is not used in the work but is provided here just in case future works require the use of a functon that reads all Action var at the same time.
+    """
+
+    def BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK(self, Blockname:str)-> Dict[str, Union[str,float,int]]:
+        """Retrieves all the Inputs and returns Dictionary with Values 
+        
+        Does not include all aspects of a Aspen Simulationsheet, for this look at Exports
+        
+        Args:
+            Blockname: String which gives the name of Block.         
+        """
+        #PAGE 5 and 6         Column Internal Design - Top and Bot, see RADFRAC_INTERNALS_INPUTS
+        Dictionary = {}
+        for Name, (Variable, Section) in RADFRAC_INTERNALS_INPUTS.items():
+            Dictionary[Name] = self._InternalsInputNode(Blockname, Variable, Section).Value
+        return Dictionary
+
+#
+#
+###################################################################################################################
+#####
+#############------- Set ALL values of Action Var values into the AspenPlus file -------##########
+#####
+###################################################################################################################
+
+    """
+    This function is not used in the work but is provided here just in case future works require the use of a functon that sets all Action var at the same time.
+
+    """
+    
+    def BLK_RADFRAC_SET_ALL_INPUTS(self, Blockname:str, Dictionary: Dict[str, Union[str,float,int]]) -> None:
+        """Takes Dictionary with Values set the ones which are given in Aspen. 
+        
+        
+        Args:
+            Blockname: String which gives the name of Block.  
+            Dictionary: Dictionary which contains all the Input variables.       
+        """
+        
+        #PAGE 5 and 6         Column Internal Design - Top and Bot, see RADFRAC_INTERNALS_INPUTS
+        for Name, (Variable, Section) in RADFRAC_INTERNALS_INPUTS.items():
+            if Dictionary.get(Name) is not None:
+                self._SetInternalsInput(Blockname, Variable, Section, Dictionary[Name])
+
+
+
+
+
+###########################################################################################################################################
+
+
+
+#ooooooooooooo   UU           U      tttttttttttttttttt         PPPPPPPPPPP         U               U       TTTTTTTTTTTTTTTTTTTTTTTT
+#o           o   UU           U              TT                 P           P       U               U                   T
+#o           o   UU           U              TT                 P           P       U               U                   T
+#o           o   UU           U              TT                 P           P       U               U                   T
+#o           o   UU           U              TT                 PPPPPPPPPPP         U               U                   T
+#o           o   UU           U              TT                 P                   U               U                   T
+#ooooooooooooo   UUUUUUUUUUUUUU              TT                 P                   U               U                   T
+                                                               #P                   UUUUUUUUUUUUUUUUU                   T
+
+
+############################################################################################################################################
+
+
+###################################################################################################################
+#####
+############# Return Target State Var Values: % apporach to flooding values from all stages in the column ##########
+#####
+###################################################################################################################
+    """
+    These are the main functions used in the paper:  retrieve % flooding from each stage and report Maximum value as State var value.
+    """
+    # Return only the target State Vaiables: Maximum % flooding at TOP and BOT sections
+    # get Max % of flooding value at Bot section   
+    def BLK_RADFRAC_Get_TOP_Max_Flooding(self, Blockname):
+        
+        
+        TopFloodingApproachList = self._SectionOutputValues(Blockname, "TOP")
+
+        return max(TopFloodingApproachList)
+
+    # get Max % of  flooding value at Bot section    
+    def BLK_RADFRAC_Get_BOT_Max_Flooding(self, Blockname):
+        # BOT Flooding
+        BotFloodingApproachList = self._SectionOutputValues(Blockname, "BOT")
+            
+        return max(BotFloodingApproachList)
+
+
+
+###################################################################################################
+#####
+############# Return ALl: % apporach to flooding values from all stages in the column #############
+#####
+###################################################################################################
+
+    """
+    This is not really used in the paper but it is provided here for reference.
+    """
+
+    
+    def BLK_RADFRAC_GET_OUTPUTS(self, Blockname:str) -> Dict[str, Union[str,float,int]]:
+        """Retrieves all Output variables for given Block and returns Dictionary of Values
+            
+            Args:
+                Blockname: String which gives the name of Block.         
+        """
+        
+        # TOP Flooding
+        TopFloodingApproachList = np.asarray(self._SectionOutputValues(Blockname, "TOP")).tolist()
+
+
+        # BOT Flooding
+        BotFloodingApproachList = np.asarray(self._SectionOutputValues(Blockname, "BOT")).tolist()
+        
+        
+        Dictionary = {
+            
+            "TopFloodingApproachList":TopFloodingApproachList,
+            "BotFloodingApproachList":BotFloodingApproachList
+            
+        }
+        return Dictionary
+
+
+###################################################################################################
+#####
+############# Evaluate one design: set inputs, run and read the target State vars ################
+#####
+###################################################################################################
+
+    def BLK_RADFRAC_EVALUATE_DESIGN(self, Blockname:str, Dictionary: Dict[str, Union[str,float,int]], FailureMap: "FailureMap" = None,
+                                    Fidelity: str = None) -> Dict[str, Union[bool,float,str]]:
+        """Sets the given internals inputs, runs the simulation and returns the Maximum % flooding of TOP and BOT
+
+        Args:
+            Blockname: String which gives the name of Block.
+            Dictionary: Dictionary with the Input variables to be set, see BLK_RADFRAC_SET_ALL_INPUTS
+            FailureMap: Optional FailureMap; designs it rates too likely to fail are not run but get its Penalty
+                as % flooding (with "Skipped" True), and every full-fidelity run design is recorded in it
+            Fidelity: Optional key of RADFRAC_FIDELITY_INPUTS to run this evaluation at, e.g. "low" for a screening
+                run; the previous fidelity of the Block is restored afterwards, so later runs are not screening runs
+        """
+        if FailureMap is not None and FailureMap.ShouldSkip(Dictionary):
+            if self.Metrics is not None:
+                self.Metrics.Inc("aspen_cache_hits_total", Cache="failuremap")
+            return dict(FailureMap.PenaltyResult(), Fidelity=Fidelity)
+        if FailureMap is not None and self.Metrics is not None:
+            self.Metrics.Inc("aspen_cache_misses_total", Cache="failuremap")
+        PreviousFidelity = self.Fidelity.get(Blockname, "high")
+        if Fidelity is not None:
+            self.SetFidelity(Blockname, Fidelity)
+        try:
+            self.BLK_RADFRAC_SET_ALL_INPUTS(Blockname, Dictionary)
+            start = time.time()
+            Converged = self.Run()
+            RunTime = time.time() - start
+            Result = {
+                "Converged":bool(Converged),
+                "TopMaxFlooding":float(self.BLK_RADFRAC_Get_TOP_Max_Flooding(Blockname)),
+                "BotMaxFlooding":float(self.BLK_RADFRAC_Get_BOT_Max_Flooding(Blockname)),
+                "RunTime":RunTime,
+                "Skipped":False,
+                "Fidelity":self.Fidelity.get(Blockname, "high")
+            }
+        finally:
+            if Fidelity is not None:
+                self.SetFidelity(Blockname, PreviousFidelity)
+        # A screening run may fail only because of its iteration cap, so it says nothing about the design region
+        if FailureMap is not None and Result["Fidelity"] == "high":
+            FailureMap.Record(Dictionary, Result["Converged"])
+        return Result
+
+    def SetFidelity(self, Blockname: str, Fidelity: str) -> None:
+        """Writes the convergence inputs of an evaluation fidelity (see RADFRAC_FIDELITY_INPUTS) into the Block
+
+        The archive values of every input touched by any fidelity are kept on first use and restored by the
+        fidelities that do not override them, so "high" always runs with the settings of the archive.
+
+        Args:
+            Blockname: String which gives the name of Block.
+            Fidelity: Key of RADFRAC_FIDELITY_INPUTS
+        """
+        if self.Fidelity.get(Blockname) == Fidelity:
+            return
+        Paths = {Path for Inputs in RADFRAC_FIDELITY_INPUTS.values() for Path in Inputs}
+        for Path in Paths:
+            if (Blockname, Path) not in self.FidelityBaseline:
+                self.FidelityBaseline[(Blockname, Path)] = self._BlockInputNode(Blockname, Path).Value
+        for Path in sorted(Paths):
+            Value = RADFRAC_FIDELITY_INPUTS[Fidelity].get(Path, self.FidelityBaseline[(Blockname, Path)])
+            self._BlockInputNode(Blockname, Path).Value = Value
+        self.Fidelity[Blockname] = Fidelity
+        self.InputGeneration += 1
+        self.OutputSnapshot = None
+
+    def _BlockInputNode(self, Blockname: str, Path: str):
+        """Returns the COM node of a Block input given by a "/"-separated path relative to Input"""
+        Node = self.BLK.Elements(Blockname).Elements("Input")
+        for Name in Path.split("/"):
+            Node = Node.Elements(Name)
+        return Node
+
+
+
+
+###################################################################################################
+#####
+############# Post-run snapshot of the outputs: read each stage value once per run ################
+#####
+###################################################################################################
+
+    def RegisterSnapshotBlock(self, Blockname: str, Variables = RADFRAC_INTERNALS_OUTPUTS) -> None:
+        """Registers the per-stage output variables of a Block to be captured into an OutputSnapshot after Run()
+
+        Args:
+            Blockname: String which gives the name of Block.
+            Variables: Per-stage column internals output variables, by default % approach to flooding
+        """
+        self.SnapshotBlocks[Blockname] = tuple(Variables)
+
+    def _ReadSectionOutputs(self, Blockname: str, Section: str, Variable: str = "CA_FLD_FAC8", Internals: str = "INT-1"):
+        """Reads the per-stage values of a column section from the COM tree, returns stage names and values"""
+        SectionNode = self.BLK.Elements(Blockname).Elements("Output").Elements(Variable).Elements(Internals).Elements(Section)
+        StageNames = self._StageNames(Blockname, Section, Variable, Internals)
+        return StageNames, [SectionNode.Elements(StageName).Value for StageName in StageNames]
+
+    def CaptureOutputSnapshot(self, Converged: bool = None) -> "OutputSnapshot":
+        """Reads all registered outputs of the registered Blocks in one sweep and keeps them as the OutputSnapshot"""
+        Snapshot = OutputSnapshot(self.RunGeneration, self.InputGeneration, Converged)
+        for Blockname, Variables in self.SnapshotBlocks.items():
+            for Variable in Variables:
+                for Section in self._SectionNames(Blockname, Variable):
+                    StageNames, Values = self._ReadSectionOutputs(Blockname, Section, Variable)
+                    Snapshot.Add(Blockname, Variable, "INT-1", Section, StageNames, Values)
+        self.OutputSnapshot = Snapshot
+        return Snapshot
+
+    def _SectionOutputValues(self, Blockname: str, Section: str, Variable: str = "CA_FLD_FAC8", Internals: str = "INT-1"):
+        """Returns the per-stage values of a column section, from the OutputSnapshot if it is current, else from COM"""
+        Snapshot = self.OutputSnapshot
+        if Snapshot is not None and Snapshot.IsCurrent(self.RunGeneration, self.InputGeneration):
+            Values = Snapshot.Values.get((Blockname, Variable, Internals, Section))
+            if Values is not None:
+                if self.Metrics is not None:
+                    self.Metrics.Inc("aspen_cache_hits_total", Cache="snapshot")
+                return Values
+        if self.Metrics is not None and Blockname in self.SnapshotBlocks:
+            # Blocks without snapshots always read from COM, which is not a miss of the snapshot cache
+            self.Metrics.Inc("aspen_cache_misses_total", Cache="snapshot")
+        return self._ReadSectionOutputs(Blockname, Section, Variable, Internals)[1]
+
+
+
+
+###########################################################################################################################################
+#####
+############# Typed snapshot of the outputs of one run ##########
+#####
+###########################################################################################################################################
+
+class OutputSnapshot():
+    """Per-stage output values of the registered Blocks read in one sweep after a Run()
+
+    The snapshot is tagged with the run and input generation counters of the Simulation that captured it and is
+    only served while both still match, so a read after an input change or a new run never returns stale values.
+
+    Args:
+        RunGeneration: Simulation.RunGeneration at capture time
+        InputGeneration: Simulation.InputGeneration at capture time
+        Converged: Convergence flag returned by the Run() that produced the values
+    """
+
+    def __init__(self, RunGeneration: int, InputGeneration: int, Converged: bool = None):
+        self.RunGeneration = RunGeneration
+        self.InputGeneration = InputGeneration
+        self.Converged = Converged
+        self.Values = {}                # (Blockname, Variable, Internals, Section) -> np.ndarray of stage values
+        self.StageNames = {}            # (Blockname, Variable, Internals, Section) -> list of stage names
+
+    def Add(self, Blockname: str, Variable: str, Internals: str, Section: str, StageNames, Values) -> None:
+        Key = (Blockname, Variable, Internals, Section)
+        self.StageNames[Key] = list(StageNames)
+        self.Values[Key] = np.array(Values, dtype=float)
+
+    def IsCurrent(self, RunGeneration: int, InputGeneration: int) -> bool:
+        """True if no run and no input change happened since the snapshot was captured"""
+        return self.RunGeneration == RunGeneration and self.InputGeneration == InputGeneration
+
+
+
+
+###########################################################################################################################################
+#####
+############# Indexed snapshot of the Aspen variable tree: enumerate once per archive, reuse in later sessions ##########
+#####
+###########################################################################################################################################
+
+class AspenTreeIndex():
+    """Compact, serialisable index of the parts of the Aspen variable tree used by this API.
+
+    Walking Tree.Elements(...) collections over COM is slow, so the internals ids, section names, stage names,
+    units and value types of the RadFrac column internals are enumerated once per .bkp archive and cached in a
+    JSON file named after the hash of the archive. Later sessions and workers load the file instead.
+
+    Args:
+        ArchiveHash: SHA-256 hex digest of the Aspen archive the index was built from
+        Blocks: Dictionary of indexed Blocks, as produced by IndexBlock()
+    """
+    IndexVersion = 1
+
+    def __init__(self, ArchiveHash: str, Blocks: Dict[str, dict] = None):
+        self.ArchiveHash = ArchiveHash
+        self.Blocks = Blocks if Blocks is not None else {}
+
+    @staticmethod
+    def HashArchive(AspenFilePath: str) -> str:
+        """Returns the SHA-256 hex digest of the Aspen archive file"""
+        Digest = hashlib.sha256()
+        with open(AspenFilePath, "rb") as ArchiveFile:
+            for Chunk in iter(lambda: ArchiveFile.read(1 << 20), b""):
+                Digest.update(Chunk)
+        return Digest.hexdigest()
+
+    @staticmethod
+    def _NodeInfo(Node) -> Dict[str, Union[str,int]]:
+        """Returns unit and value type of a COM node, None where Aspen does not provide them"""
+        Info = {}
+        for Key, Attribute in (("Unit", "UnitString"), ("ValueType", "ValueType")):
+            try:
+                Info[Key] = getattr(Node, Attribute)
+            except Exception:
+                Info[Key] = None
+        return Info
+
+    @classmethod
+    def IndexBlock(cls, Sim: "Simulation", Blockname: str) -> dict:
+        """Walks the column internals subtree of a RadFrac Block once and returns its index entry
+
+        Args:
+            Sim: Simulation with the archive loaded
+            Blockname: String which gives the name of Block.
+        """
+        BlockNode = Sim.BLK.Elements(Blockname)
+
+        Inputs = {}
+        for Variable in sorted({Variable for Variable, Section in RADFRAC_INTERNALS_INPUTS.values()}):
+            VariableNode = BlockNode.Elements("Input").Elements(Variable)
+            for InternalsNode in VariableNode.Elements:
+                for SectionNode in InternalsNode.Elements:
+                    Path = "/".join((Variable, InternalsNode.Name, SectionNode.Name))
+                    Inputs[Path] = cls._NodeInfo(SectionNode)
+
+        Outputs = {}
+        for Variable in RADFRAC_INTERNALS_OUTPUTS:
+            Outputs[Variable] = {}
+            for InternalsNode in BlockNode.Elements("Output").Elements(Variable).Elements:
+                Outputs[Variable][InternalsNode.Name] = {}
+                for SectionNode in InternalsNode.Elements:
+                    Stages = [stage for stage in SectionNode.Elements]
+                    Entry = {"Stages": [stage.Name for stage in Stages]}
+                    # All stages of a section share unit and value type, keep them once
+                    Entry.update(cls._NodeInfo(Stages[0]) if Stages else {"Unit": None, "ValueType": None})
+                    Outputs[Variable][InternalsNode.Name][SectionNode.Name] = Entry
+
+        return {"Inputs": Inputs, "Outputs": Outputs}
+
+    @staticmethod
+    def CachePath(AspenFilePath: str, ArchiveHash: str, CacheDirectory: str = None) -> str:
+        """Returns the path of the index file of an archive"""
+        if CacheDirectory is None:
+            CacheDirectory = os.path.join(os.path.dirname(os.path.abspath(AspenFilePath)), ".aspen_tree_index")
+        return os.path.join(CacheDirectory, ArchiveHash + ".json")
+
+    def Save(self, IndexPath: str) -> None:
+        """Writes the index to a compact JSON file"""
+        os.makedirs(os.path.dirname(os.path.abspath(IndexPath)), exist_ok=True)
+        TempPath = IndexPath + ".tmp"
+        with open(TempPath, "w") as IndexFile:
+            json.dump({"IndexVersion": self.IndexVersion, "ArchiveHash": self.ArchiveHash, "Blocks": self.Blocks},
+                      IndexFile, separators=(",", ":"))
+        os.replace(TempPath, IndexPath)     # Atomic, workers may read the file concurrently
+
+    @classmethod
+    def Load(cls, IndexPath: str) -> "AspenTreeIndex":
+        """Reads an index file, returns None if the file is missing or was written by another IndexVersion"""
+        try:
+            with open(IndexPath) as IndexFile:
+                Data = json.load(IndexFile)
+        except (OSError, ValueError):
+            return None
+        if Data.get("IndexVersion") != cls.IndexVersion:
+            return None
+        return cls(Data["ArchiveHash"], Data["Blocks"])
+
+    @classmethod
+    def LoadOrBuild(cls, Sim: "Simulation", AspenFilePath: str, Blocknames, CacheDirectory: str = None) -> "AspenTreeIndex":
+        """Loads the cached index of the archive and only walks the COM tree for Blocks that are not indexed yet
+
+        A Block with a section without stages (e.g. indexed before any results existed) is not cached, so it is
+        indexed again by the next session instead of serving empty stage lists.
+        """
+        ArchiveHash = cls.HashArchive(AspenFilePath)
+        IndexPath = cls.CachePath(AspenFilePath, ArchiveHash, CacheDirectory)
+        Index = cls.Load(IndexPath)
+        if Index is None or Index.ArchiveHash != ArchiveHash:
+            Index = cls(ArchiveHash)
+        Missing = [Blockname for Blockname in Blocknames if Blockname not in Index.Blocks]
+        Indexed = False
+        for Blockname in Missing:
+            Entry = cls.IndexBlock(Sim, Blockname)
+            if all(Section["Stages"] for Internals in Entry["Outputs"].values()
+                   for Sections in Internals.values() for Section in Sections.values()):
+                Index.Blocks[Blockname] = Entry
+                Indexed = True
+        if Indexed:
+            Index.Save(IndexPath)
+        return Index
+
+    def StageNames(self, Blockname: str, Section: str, Variable: str = "CA_FLD_FAC8", Internals: str = "INT-1"):
+        """Returns the list of stage names of a column section, None if not indexed or without stages"""
+        try:
+            return self.Blocks[Blockname]["Outputs"][Variable][Internals][Section]["Stages"] or None
+        except KeyError:
+            return None
+
+    def Sections(self, Blockname: str, Variable: str = "CA_FLD_FAC8", Internals: str = "INT-1"):
+        """Returns the list of section names of a column internals, None if not indexed"""
+        try:
+            return list(self.Blocks[Blockname]["Outputs"][Variable][Internals])
+        except KeyError:
+            return None
+
+    def InternalsIds(self, Blockname: str, Variable: str = "CA_FLD_FAC8"):
+        """Returns the list of column internals ids (e.g. INT-1) of a Block, None if not indexed"""
+        try:
+            return list(self.Blocks[Blockname]["Outputs"][Variable])
+        except KeyError:
+            return None
+
+    def InputInfo(self, Blockname: str, Variable: str, Section: str, Internals: str = "INT-1") -> Dict[str, Union[str,int]]:
+        """Returns unit and value type of an internals input, None if not indexed"""
+        return self.Blocks.get(Blockname, {}).get("Inputs", {}).get("/".join((Variable, Internals, Section)))
+
+
+
+
+###########################################################################################################################################
+#####
+############# Managed engine lifecycle: keep one loaded document per worker and reset it between experiments ##########
+#####
+###########################################################################################################################################
+
+class AspenEngineManager():
+    """Keeps a loaded, pre-warmed Simulation per worker and archive, so experiments/seeds only pay a Reset().
+
+    The first Acquire() of a worker launches Aspen and loads the archive (without changing the process working
+    directory) and captures the baseline inputs of the Blocks. Later Acquire() calls of the same worker reset the
+    document with Reinit and the baseline inputs instead of paying InitFromArchive2 again.
+
+    Args:
+        Blocknames: List of RadFrac Block names whose inputs are restored between experiments
+        VISIBILITY: Toggles the opening and interactive running of the Aspen simulations
+        DocumentFactory: Optional callable returning a new Aspen document, defaults to win32 "Apwn.Document"
+        QUIET: Suppresses the progress prints of the Simulations
+        Metrics: Optional SimulationMetrics shared by the Simulations
+    """
+
+    def __init__(self, Blocknames, VISIBILITY: bool = False, DocumentFactory = None, QUIET: bool = False, Metrics: "SimulationMetrics" = None):
+        self.Blocknames = list(Blocknames)
+        self.VISIBILITY = VISIBILITY
+        self.DocumentFactory = DocumentFactory
+        self.QUIET = QUIET
+        self.Metrics = Metrics
+        self.Engines = {}                   # (Worker, AspenFilePath) -> Simulation
+        self._Lock = threading.Lock()
+
+    @staticmethod
+    def _Worker(Worker):
+        # COM documents belong to the thread that created them, so the default worker is the calling thread
+        return threading.get_ident() if Worker is None else Worker
+
+    def Acquire(self, AspenFileName: str, WorkingDirectoryPath: str, Worker = None) -> Simulation:
+        """Returns the worker's Simulation of the archive, loading it on first use and resetting it afterwards
+
+        Args:
+            AspenFileName: Name of the Aspenfile on which you are working with
+            WorkingDirectoryPath: Path to the Folder of the Aspenfile
+            Worker: Key of the worker owning the engine, defaults to the current thread
+        """
+        Key = (self._Worker(Worker), os.path.abspath(os.path.join(WorkingDirectoryPath, AspenFileName)))
+        with self._Lock:
+            Sim = self.Engines.get(Key)
+        if Sim is not None:
+            Sim.Reset()
+            return Sim
+
+        AspenDocument = self.DocumentFactory() if self.DocumentFactory is not None else None
+        Sim = Simulation(AspenFileName, WorkingDirectoryPath, self.VISIBILITY, ChangeDirectory=False, AspenDocument=AspenDocument,
+                         QUIET=self.QUIET, Metrics=self.Metrics)
+        for Blockname in self.Blocknames:
+            Sim.CaptureBaselineInputs(Blockname)
+        with self._Lock:
+            self.Engines[Key] = Sim
+        return Sim
+
+    def Release(self, Worker = None) -> None:
+        """Closes all engines of a worker, defaults to the current thread"""
+        Worker = self._Worker(Worker)
+        with self._Lock:
+            Keys = [Key for Key in self.Engines if Key[0] == Worker]
+            Sims = [self.Engines.pop(Key) for Key in Keys]
+        for Sim in Sims:
+            Sim.CloseAspen()
+
+    def CloseAll(self) -> None:
+        """Closes every managed engine"""
+        with self._Lock:
+            Sims = list(self.Engines.values())
+            self.Engines.clear()
+        for Sim in Sims:
+            Sim.CloseAspen()
+
+
+
+
+###########################################################################################################################################
+#####
+############# Mock Aspen backend: in-memory document with the same tree layout, to run this API without Aspen/Windows ##########
+#####
+###########################################################################################################################################
+
+class MockAspenNode():
+    """In-memory stand-in of an Aspen tree node (IHNode): Name, Value, UnitString, ValueType and Elements"""
+
+    def __init__(self, Name: str, Value = None, UnitString: str = None, ValueType: int = None):
+        self.Name = Name
+        self.Value = Value
+        self.UnitString = UnitString
+        self.ValueType = ValueType
+        self.Children = {}
+
+    def Add(self, Name: str, Value = None, UnitString: str = None, ValueType: int = None) -> "MockAspenNode":
+        if Name not in self.Children:
+            self.Children[Name] = MockAspenNode(Name, Value, UnitString, ValueType)
+        return self.Children[Name]
+
+    @property
+    def Elements(self) -> "MockAspenCollection":
+        return MockAspenCollection(self)
+
+
+class MockAspenCollection():
+    """In-memory stand-in of an Aspen Elements collection: callable by name and iterable over the child nodes"""
+
+    def __init__(self, Node: MockAspenNode):
+        self.Node = Node
+
+    def __call__(self, Name: str) -> MockAspenNode:
+        return self.Node.Children[Name]
+
+    def Item(self, Name: str) -> MockAspenNode:
+        return self.Node.Children[Name]
+
+    def __iter__(self):
+        return iter(list(self.Node.Children.values()))
+
+    @property
+    def Count(self) -> int:
+        return len(self.Node.Children)
+
+
+class _MockAspenEngine():
+    def __init__(self, Document: "MockAspenDocument"):
+        self.Document = Document
+
+    def Run2(self) -> None:
+        self.Document.Run2()
+
+
+class MockAspenDocument():
+    """In-memory stand-in of an "Apwn.Document" with RadFrac Blocks, for tests and benchmarks on any OS
+
+    Run2() computes % approach to flooding per stage from a simple correlation of the internals inputs
+    (it is NOT a column model) and fails to converge (PER_ERROR = 1) if any internals input is not positive.
+    Lowering MAXOL shortens the emulated solver time, raising TOLOL above 1e-4 biases the flooding values.
+    Stream results and condenser/reboiler duties are fixed placeholder values.
+
+    Args:
+        Blocknames: Names of the RadFrac Blocks in the document
+        TopStages: Stage numbers of the TOP section
+        BotStages: Stage numbers of the BOT section
+        RunDelay: Seconds each Run2() sleeps to emulate the solver time
+        Streamnames: Names of the material streams
+        Components: Component ids of the stream mole fractions
+    """
+    DefaultInputs = {"CA_DIAM": 1.5, "CA_TRAY_SPC": 0.6096, "CA_WEIR_HT": 0.0508, "CA_DC_CLEAR": 0.0381,
+                     "CA_WEIRLN_SD": 0.05, "CA_HOLE_DIAM": 0.0127}
+
+    def __init__(self, Blocknames = ("B1",), TopStages = range(2, 11), BotStages = range(11, 20), RunDelay: float = 0.0,
+                 Streamnames = ("FEED", "DIST", "BOTT"), Components = ("BENZENE", "TOLUENE")):
+        self.RunDelay = RunDelay
+        self.RunCount = 0
+        self.Visible = False
+        self.SuppressDialogs = False
+        self.COMPSTATUS = 0x00002081
+        self.FullName = "Mock.bkp"
+        self.Engine = _MockAspenEngine(self)
+        self.Tree = MockAspenNode("Root")
+        Data = self.Tree.Add("Data")
+        Data.Add("Results Summary").Add("Run-Status").Add("Output").Add("PER_ERROR", 0)
+        for i, Streamname in enumerate(Streamnames):
+            StreamOutput = Data.Add("Streams").Add(Streamname).Add("Output")
+            StreamOutput.Add("MOLEFLMX").Add("MIXED", 100.0 / (1 + i), "kmol/hr", 2)
+            StreamOutput.Add("MASSFLMX").Add("MIXED", 8500.0 / (1 + i), "kg/hr", 2)
+            StreamOutput.Add("TEMP_OUT").Add("MIXED", 90.0 + 10 * i, "C", 2)
+            StreamOutput.Add("PRES_OUT").Add("MIXED", 1.01325, "bar", 2)
+            for Component in Components:
+                StreamOutput.Add("MOLEFRAC").Add("MIXED").Add(Component, 1.0 / len(Components), "", 2)
+        self.Sections = {"TOP": list(TopStages), "BOT": list(BotStages)}
+        for Blockname in Blocknames:
+            BlockNode = Data.Add("Blocks").Add(Blockname)
+            BlockNode.Add("Input").Add("MAXOL", 25, "", 1)
+            BlockNode.Add("Input").Add("TOLOL", 1e-4, "", 2)
+            for Variable, Value in self.DefaultInputs.items():
+                for Section in self.Sections:
+                    BlockNode.Add("Input").Add(Variable).Add("INT-1").Add(Section, Value, "meter", 2)
+            BlockNode.Add("Output").Add("COND_DUTY", -1.2e6, "cal/sec", 2)
+            BlockNode.Add("Output").Add("REB_DUTY", 1.4e6, "cal/sec", 2)
+            for Section, Stages in self.Sections.items():
+                SectionNode = BlockNode.Add("Output").Add("CA_FLD_FAC8").Add("INT-1").Add(Section)
+                for Stage in Stages:
+                    SectionNode.Add(str(Stage), 0.0, "", 2)
+
+    def InitFromArchive2(self, AspenFilePath: str) -> None:
+        self.FullName = AspenFilePath
+
+    def Run2(self) -> None:
+        self.RunCount += 1
+        Failed = False
+        for BlockNode in self.Tree.Elements("Data").Elements("Blocks").Elements:
+            if self.RunDelay:
+                time.sleep(self.RunDelay * min(BlockNode.Elements("Input").Elements("MAXOL").Value / 25, 1.0))
+            Bias = 1.0 + 20.0 * (BlockNode.Elements("Input").Elements("TOLOL").Value - 1e-4)
+            for Section in self.Sections:
+                Inputs = {Variable: BlockNode.Elements("Input").Elements(Variable).Elements("INT-1").Elements(Section).Value
+                          for Variable in self.DefaultInputs}
+                if any(Value is None or Value <= 0 for Value in Inputs.values()):
+                    Failed = True
+                    continue
+                Flooding = (80.0 * (1.5 / Inputs["CA_DIAM"]) ** 2 * (0.6096 / Inputs["CA_TRAY_SPC"]) ** 0.5
+                            * (Inputs["CA_WEIR_HT"] / 0.0508) ** 0.1 * (0.0381 / Inputs["CA_DC_CLEAR"]) ** 0.05) * Bias
+                Stages = list(BlockNode.Elements("Output").Elements("CA_FLD_FAC8").Elements("INT-1").Elements(Section).Elements)
+                for i, Stage in enumerate(Stages):
+                    Stage.Value = Flooding * (0.9 + 0.2 * i / max(len(Stages) - 1, 1))
+        self.Tree.Elements("Data").Elements("Results Summary").Elements("Run-Status").Elements("Output").Elements("PER_ERROR").Value = int(Failed)
+
+    def Stop(self) -> None:
+        pass
+
+    def Reinit(self) -> None:
+        pass
+
+    def Save(self) -> None:
+        pass
+
+    def Close(self, AspenFilePath: str = None) -> None:
+        pass
+
+
+
+
+###########################################################################################################################################
+#####
+############# Simulation server: set-design/run/read-flooding over a socket with a compact binary protocol ##########
+#####
+###########################################################################################################################################
+
+"""
+Each message is a header (opcode: uint8, request id: uint32, payload length: uint32, network byte order) followed
+by the payload. Designs travel as float64 vectors in RADFRAC_INTERNALS_INPUTS order (NaN = leave unchanged).
+A connection answers its requests in order, so a client may pipeline several requests before reading.
+"""
+
+RPC_HEADER = struct.Struct("!BII")
+RPC_SET_DESIGN = 1          # payload: design vector                 -> empty
+RPC_RUN = 2                 # payload: empty                         -> converged (?), runtime (d)
+RPC_READ_FLOODING = 3       # payload: empty                         -> top, bot max % flooding (dd)
+RPC_EVALUATE = 4            # payload: design vector                 -> converged, top, bot, runtime (?ddd)
+RPC_ERROR = 255             # payload: utf-8 error message
+RPC_DESIGN = struct.Struct("!%dd" % len(RADFRAC_INTERNALS_INPUTS))
+RPC_RUN_RESULT = struct.Struct("!?d")
+RPC_FLOODING_RESULT = struct.Struct("!dd")
+RPC_EVALUATE_RESULT = struct.Struct("!?ddd")
+
+
+def _RecvExactly(Sock: socket.socket, Size: int) -> bytes:
+    Buffer = bytearray()
+    while len(Buffer) < Size:
+        Chunk = Sock.recv(Size - len(Buffer))
+        if not Chunk:
+            raise ConnectionError("Simulation server connection closed")
+        Buffer.extend(Chunk)
+    return bytes(Buffer)
+
+
+class SimulationServer():
+    """Serves a Simulation over TCP so that evaluations can be distributed across machines
+
+    All requests are handled in the thread calling ServeForever(), which should be the thread that created the
+    Simulation (COM documents are bound to their thread). Connections are multiplexed with selectors.
+
+    Args:
+        Sim: Simulation with the archive loaded
+        Blockname: String which gives the name of the RadFrac Block
+        Host: Interface to listen on
+        Port: TCP port, 0 picks a free one (see Address)
+    """
+
+    def __init__(self, Sim: Simulation, Blockname: str, Host: str = "127.0.0.1", Port: int = 0):
+        self.Sim = Sim
+        self.Blockname = Blockname
+        self.Listener = socket.create_server((Host, Port))
+        self.Listener.setblocking(False)
+        self.Address = self.Listener.getsockname()[:2]
+        self.Selector = selectors.DefaultSelector()
+        self.Selector.register(self.Listener, selectors.EVENT_READ)
+        self._Stopped = threading.Event()
+
+    def Handle(self, Opcode: int, Payload: bytes):
+        """Executes one request on the Simulation, returns (response opcode, response payload)"""
+        if Opcode == RPC_SET_DESIGN:
+            self.Sim.BLK_RADFRAC_SET_ALL_INPUTS(self.Blockname, VectorToDesign(RPC_DESIGN.unpack(Payload)))
+            return Opcode, b""
+        if Opcode == RPC_RUN:
+            start = time.time()
+            Converged = self.Sim.Run()
+            return Opcode, RPC_RUN_RESULT.pack(bool(Converged), time.time() - start)
+        if Opcode == RPC_READ_FLOODING:
+            return Opcode, RPC_FLOODING_RESULT.pack(self.Sim.BLK_RADFRAC_Get_TOP_Max_Flooding(self.Blockname),
+                                                    self.Sim.BLK_RADFRAC_Get_BOT_Max_Flooding(self.Blockname))
+        if Opcode == RPC_EVALUATE:
+            Result = self.Sim.BLK_RADFRAC_EVALUATE_DESIGN(self.Blockname, VectorToDesign(RPC_DESIGN.unpack(Payload)))
+            return Opcode, RPC_EVALUATE_RESULT.pack(Result["Converged"], Result["TopMaxFlooding"],
+                                                    Result["BotMaxFlooding"], Result["RunTime"])
+        raise ValueError(f"Unknown opcode {Opcode}")
+
+    def _Process(self, Connection: socket.socket, Buffer: bytearray) -> None:
+        while len(Buffer) >= RPC_HEADER.size:
+            Opcode, RequestId, Length = RPC_HEADER.unpack_from(Buffer)
+            if len(Buffer) < RPC_HEADER.size + Length:
+                return
+            Payload = bytes(Buffer[RPC_HEADER.size:RPC_HEADER.size + Length])
+            del Buffer[:RPC_HEADER.size + Length]
+            try:
+                Opcode, Response = self.Handle(Opcode, Payload)
+            except Exception as Error:
+                Opcode, Response = RPC_ERROR, repr(Error).encode("utf-8")
+            Connection.setblocking(True)
+            Connection.sendall(RPC_HEADER.pack(Opcode, RequestId, len(Response)) + Response)
+            Connection.setblocking(False)
+
+    def ServeForever(self, PollInterval: float = 0.2) -> None:
+        """Handles requests until Shutdown() is called"""
+        Buffers = {}
+        while not self._Stopped.is_set():
+            for Key, Events in self.Selector.select(PollInterval):
+                if Key.fileobj is self.Listener:
+                    try:
+                        Connection, _ = self.Listener.accept()
+                    except BlockingIOError:
+                        continue
+                    Connection.setblocking(False)
+                    Connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    Buffers[Connection] = bytearray()
+                    self.Selector.register(Connection, selectors.EVENT_READ)
+                    continue
+                Connection = Key.fileobj
+                try:
+                    Data = Connection.recv(1 << 16)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    Data = b""
+                if not Data:
+                    self.Selector.unregister(Connection)
+                    Buffers.pop(Connection, None)
+                    Connection.close()
+                    continue
+                Buffers[Connection].extend(Data)
+                try:
+                    self._Process(Connection, Buffers[Connection])
+                except OSError:
+                    self.Selector.unregister(Connection)
+                    Buffers.pop(Connection, None)
+                    Connection.close()
+        for Connection in Buffers:
+            self.Selector.unregister(Connection)
+            Connection.close()
+        self.Selector.unregister(self.Listener)
+        self.Listener.close()
+
+    def Shutdown(self) -> None:
+        """Stops ServeForever() after the current poll interval"""
+        self._Stopped.set()
+
+
+class SimulationClient():
+    """Client of one SimulationServer: set-design/run/read-flooding with the same meaning as on Simulation
+
+    Args:
+        Host: Host name or IP of the server
+        Port: TCP port of the server
+        Timeout: Socket timeout in seconds, None waits forever
+    """
+
+    def __init__(self, Host: str, Port: int, Timeout: float = None):
+        self.Address = (Host, Port)
+        self.Timeout = Timeout
+        self.Sock = None
+        self._NextRequestId = 0
+
+    def Connect(self) -> None:
+        self.Close()
+        self.Sock = socket.create_connection(self.Address, timeout=self.Timeout)
+        self.Sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def Close(self) -> None:
+        if self.Sock is not None:
+            try:
+                self.Sock.close()
+            finally:
+                self.Sock = None
+
+    def Send(self, Opcode: int, Payload: bytes = b"") -> int:
+        """Sends a request without waiting for the response, returns its request id"""
+        if self.Sock is None:
+            self.Connect()
+        self._NextRequestId = (self._NextRequestId + 1) & 0xFFFFFFFF
+        self.Sock.sendall(RPC_HEADER.pack(Opcode, self._NextRequestId, len(Payload)) + Payload)
+        return self._NextRequestId
+
+    def Receive(self):
+        """Reads the next response, returns (opcode, request id, payload), raises RuntimeError for server errors"""
+        Opcode, RequestId, Length = RPC_HEADER.unpack(_RecvExactly(self.Sock, RPC_HEADER.size))
+        Payload = _RecvExactly(self.Sock, Length)
+        if Opcode == RPC_ERROR:
+            raise RuntimeError(f"Simulation server error: {Payload.decode('utf-8')}")
+        return Opcode, RequestId, Payload
+
+    def _Call(self, Opcode: int, Payload: bytes = b"") -> bytes:
+        self.Send(Opcode, Payload)
+        return self.Receive()[2]
+
+    def SetDesign(self, Dictionary: Dict[str, Union[str,float,int]]) -> None:
+        self._Call(RPC_SET_DESIGN, RPC_DESIGN.pack(*DesignToVector(Dictionary)))
+
+    def Run(self) -> bool:
+        return RPC_RUN_RESULT.unpack(self._Call(RPC_RUN))[0]
+
+    def ReadFlooding(self):
+        """Returns (TOP, BOT) Maximum % flooding"""
+        return RPC_FLOODING_RESULT.unpack(self._Call(RPC_READ_FLOODING))
+
+    def Evaluate(self, Dictionary: Dict[str, Union[str,float,int]]) -> Dict[str, Union[bool,float]]:
+        """Same as Simulation.BLK_RADFRAC_EVALUATE_DESIGN, in one round trip"""
+        return _EvaluateResult(self._Call(RPC_EVALUATE, RPC_DESIGN.pack(*DesignToVector(Dictionary))))
+
+
+def _EvaluateResult(Payload: bytes) -> Dict[str, Union[bool,float]]:
+    Converged, TopMaxFlooding, BotMaxFlooding, RunTime = RPC_EVALUATE_RESULT.unpack(Payload)
+    return {"Converged":Converged, "TopMaxFlooding":TopMaxFlooding, "BotMaxFlooding":BotMaxFlooding, "RunTime":RunTime, "Skipped":False, "Fidelity":None}
+
+
+class SimulationClientPool():
+    """Load-balances batches of design evaluations over several SimulationServers
+
+    One thread per server pulls designs from a shared queue (so faster servers take more work) and keeps up to
+    Depth requests in flight on its connection. On a connection error the in-flight designs go back to the queue
+    and the thread reconnects; a server that fails MaxRetries times in a row is dropped for the rest of the batch.
+    Idle threads stay until every design of the batch has a result, so they take over requeued designs.
+
+    Args:
+        Addresses: List of (Host, Port) of the servers
+        Depth: Number of pipelined requests per connection
+        MaxRetries: Consecutive connection failures before a server is dropped
+        Timeout: Socket timeout in seconds, should exceed the longest expected solver run
+    """
+
+    def __init__(self, Addresses, Depth: int = 2, MaxRetries: int = 3, Timeout: float = 600.0):
+        self.Clients = [SimulationClient(Host, Port, Timeout) for Host, Port in Addresses]
+        self.Depth = Depth
+        self.MaxRetries = MaxRetries
+
+    @staticmethod
+    def _Done(Batch: dict) -> None:
+        with Batch["Condition"]:
+            Batch["Outstanding"] -= 1
+            Batch["Condition"].notify_all()
+
+    def _Worker(self, Client: SimulationClient, Batch: dict, Results: list, Errors: list) -> None:
+        Work, Condition = Batch["Work"], Batch["Condition"]
+        InFlight = []           # (index in batch, design), responses come back in this order
+        Failures = 0
+        while True:
+            if not InFlight:
+                # Nothing to send: finish only once the whole batch is answered, another server may still drop
+                with Condition:
+                    Condition.wait_for(lambda: Batch["Outstanding"] == 0 or not Work.empty())
+                    if Batch["Outstanding"] == 0:
+                        return
+            try:
+                while len(InFlight) < self.Depth:
+                    try:
+                        Index, Design = Work.get_nowait()
+                    except queue.Empty:
+                        break
+                    InFlight.append((Index, Design))
+                    Client.Send(RPC_EVALUATE, RPC_DESIGN.pack(*DesignToVector(Design)))
+                if not InFlight:
+                    continue
+                Payload = Client.Receive()[2]
+                Index, Design = InFlight.pop(0)
+                Results[Index] = _EvaluateResult(Payload)
+                Failures = 0
+                self._Done(Batch)
+            except RuntimeError as Error:
+                # Server answered with an error: the design itself failed, not the connection
+                Index, Design = InFlight.pop(0)
+                Errors.append((Index, Error))
+                self._Done(Batch)
+            except OSError:
+                with Condition:
+                    for Item in InFlight:
+                        Work.put(Item)
+                    Condition.notify_all()
+                InFlight = []
+                Client.Close()
+                Failures += 1
+                if Failures >= self.MaxRetries:
+                    with Condition:
+                        Batch["Workers"] -= 1
+                        Condition.notify_all()
+                    return
+                time.sleep(0.1 * 2 ** Failures)
+
+    def EvaluateBatch(self, Designs) -> list:
+        """Evaluates a list of design Dictionaries, returns the result Dictionaries in the same order"""
+        Work = queue.Queue()
+        for Index, Design in enumerate(Designs):
+            Work.put((Index, Design))
+        Batch = {"Work":Work, "Condition":threading.Condition(), "Outstanding":len(Designs), "Workers":len(self.Clients)}
+        Results = [None] * len(Designs)
+        Errors = []
+        Threads = [threading.Thread(target=self._Worker, args=(Client, Batch, Results, Errors), daemon=True)
+                   for Client in self.Clients]
+        for Thread in Threads:
+            Thread.start()
+        with Batch["Condition"]:
+            # Done when all designs are answered or when no server is left to answer the rest
+            Batch["Condition"].wait_for(lambda: Batch["Outstanding"] == 0 or Batch["Workers"] == 0)
+            Batch["Outstanding"] = 0
+            Batch["Condition"].notify_all()
+        for Thread in Threads:
+            Thread.join()
+        if Errors:
+            raise RuntimeError(f"{len(Errors)} evaluations failed, first: {Errors[0][1]}")
+        if any(Result is None for Result in Results):
+            raise ConnectionError("No Simulation server left to finish the batch")
+        return Results
+
+    def Close(self) -> None:
+        for Client in self.Clients:
+            Client.Close()
+
+
+def BenchmarkServerPool(NumberOfServers = (1, 2, 4), NumberOfDesigns: int = 32, RunDelay: float = 0.05, Depth: int = 2) -> Dict[int, float]:
+    """Measures evaluations per second of a SimulationClientPool against localhost servers on MockAspenDocument
+
+    Nothing is printed, the caller prints or logs the returned Dictionary.
+
+    Args:
+        NumberOfServers: Pool sizes to measure
+        NumberOfDesigns: Designs per batch
+        RunDelay: Emulated solver seconds per Run2()
+        Depth: Pipelined requests per connection
+    Returns:
+        Dictionary of number of servers -> evaluations per second
+    """
+    Throughput = {}
+    Rng = np.random.default_rng(0)
+    Designs = [{"ColDiam_Top": float(Diam), "ColDiam_Bot": float(Diam)} for Diam in Rng.uniform(1.0, 2.5, NumberOfDesigns)]
+    for N in NumberOfServers:
+        Servers, Threads = [], []
+        Ready = queue.Queue()
+
+        def Serve():
+            # The Simulation is created in the serving thread, as it would be in a server process
+            Server = SimulationServer(Simulation("Mock.bkp", ".", False, ChangeDirectory=False,
+                                                 AspenDocument=MockAspenDocument(RunDelay=RunDelay), QUIET=True), "B1")
+            Ready.put(Server)
+            Server.ServeForever()
+
+        for _ in range(N):
+            Threads.append(threading.Thread(target=Serve, daemon=True))
+            Threads[-1].start()
+            Servers.append(Ready.get())
+        Pool = SimulationClientPool([Server.Address for Server in Servers], Depth=Depth)
+        start = time.time()
+        Pool.EvaluateBatch(Designs)
+        Throughput[N] = NumberOfDesigns / (time.time() - start)
+        Pool.Close()
+        for Server in Servers:
+            Server.Shutdown()
+        for Thread in Threads:
+            Thread.join()
+    return Throughput
+
+
+
+
+###########################################################################################################################################
+#####
+############# Record and replay of COM sessions: capture a real Aspen session once, replay it offline on any OS ##########
+#####
+###########################################################################################################################################
+
+"""
+A trace is a gzip'ed file with one JSON list per line. The first item is the event kind:
+    ["E", Path, Seconds]                Elements(Name) traversal reaching Path
+    ["L", Path, [Names], Seconds]       Enumeration of the Elements collection of Path
+    ["G", Path, Value, Seconds]         Read of Path.Value
+    ["S", Path, Value]                  Write of Path.Value
+    ["A", Path, Attribute, Value]       Read of another node attribute (UnitString, ValueType, COMPSTATUS, ...)
+    ["N", Path, Attribute, Value]       Write of another node attribute
+    ["R", Seconds]                      Engine.Run2() / Run2()
+    ["D", Attribute, Value]             Read of a document attribute (FullName, COMPSTATUS, ...)
+    ["P", Attribute, Value]             Write of a document attribute (Visible, SuppressDialogs, ...)
+    ["C", Method, [Args], Seconds]      Other document method call (InitFromArchive2, Reinit, Close, ...)
+Paths are the node names from the Tree root joined with "/", e.g. "Data/Blocks/B1/Input/CA_DIAM/INT-1/TOP".
+"""
+
+def _TraceValue(Value):
+    """Returns Value if JSON can hold it, else its string form"""
+    return Value if Value is None or isinstance(Value, (bool, int, float, str)) else str(Value)
+
+def _JoinPath(Path: str, Name: str) -> str:
+    return Name if not Path else Path + "/" + Name
+
+
+class RecordingAspenDocument():
+    """Proxy around an Aspen document that logs every tree traversal, Value read/write and run with timings
+
+    Use it in place of the document, e.g. Simulation(..., AspenDocument=RecordingAspenDocument(win32.Dispatch("Apwn.Document")))
+    or Sim.AspenSimulation = RecordingAspenDocument(Sim.AspenSimulation), then SaveTrace() at the end of the session.
+
+    Args:
+        Document: The Aspen document to be recorded
+    """
+
+    def __init__(self, Document):
+        object.__setattr__(self, "Document", Document)
+        object.__setattr__(self, "Events", [])
+
+    def Log(self, *Event) -> None:
+        self.Events.append(list(Event))
+
+    @property
+    def Tree(self) -> "_RecordingAspenNode":
+        return _RecordingAspenNode(self, self.Document.Tree, "")
+
+    @property
+    def Engine(self) -> "_RecordingAspenEngine":
+        return _RecordingAspenEngine(self)
+
+    def Run2(self) -> None:
+        start = time.perf_counter()
+        self.Document.Run2()
+        self.Log("R", time.perf_counter() - start)
+
+    def __getattr__(self, Attribute: str):
+        Value = getattr(self.Document, Attribute)
+        if not callable(Value):
+            self.Log("D", Attribute, _TraceValue(Value))
+            return Value
+
+        def Call(*Args):
+            start = time.perf_counter()
+            Result = Value(*Args)
+            self.Log("C", Attribute, [_TraceValue(Arg) for Arg in Args], time.perf_counter() - start)
+            return Result
+        return Call
+
+    def __setattr__(self, Attribute: str, Value) -> None:
+        setattr(self.Document, Attribute, Value)
+        self.Log("P", Attribute, _TraceValue(Value))
+
+    def SaveTrace(self, TracePath: str) -> None:
+        """Writes the recorded events to a compact gzip'ed JSON-lines trace file"""
+        with gzip.open(TracePath, "wt", encoding="utf-8") as TraceFile:
+            for Event in self.Events:
+                TraceFile.write(json.dumps(Event, separators=(",", ":")) + "\n")
+
+
+class _RecordingAspenEngine():
+    def __init__(self, Recorder: RecordingAspenDocument):
+        self.Recorder = Recorder
+
+    def Run2(self) -> None:
+        start = time.perf_counter()
+        self.Recorder.Document.Engine.Run2()
+        self.Recorder.Log("R", time.perf_counter() - start)
+
+
+class _RecordingAspenNode():
+    def __init__(self, Recorder: RecordingAspenDocument, Node, Path: str):
+        object.__setattr__(self, "_Recorder", Recorder)
+        object.__setattr__(self, "_Node", Node)
+        object.__setattr__(self, "_Path", Path)
+
+    @property
+    def Name(self) -> str:
+        return self._Node.Name
+
+    @property
+    def Value(self):
+        start = time.perf_counter()
+        Value = self._Node.Value
+        self._Recorder.Log("G", self._Path, _TraceValue(Value), time.perf_counter() - start)
+        return Value
+
+    @Value.setter
+    def Value(self, Value) -> None:
+        self._Node.Value = Value
+        self._Recorder.Log("S", self._Path, _TraceValue(Value))
+
+    @property
+    def Elements(self) -> "_RecordingAspenCollection":
+        return _RecordingAspenCollection(self._Recorder, self._Node.Elements, self._Path)
+
+    def __getattr__(self, Attribute: str):
+        Value = getattr(self._Node, Attribute)
+        self._Recorder.Log("A", self._Path, Attribute, _TraceValue(Value))
+        return Value
+
+    def __setattr__(self, Attribute: str, Value) -> None:
+        if Attribute == "Value":
+            # Through the property, which logs the "S" event
+            return object.__setattr__(self, Attribute, Value)
+        setattr(self._Node, Attribute, Value)
+        self._Recorder.Log("N", self._Path, Attribute, _TraceValue(Value))
+
+
+class _RecordingAspenCollection():
+    def __init__(self, Recorder: RecordingAspenDocument, Collection, Path: str):
+        self._Recorder = Recorder
+        self._Collection = Collection
+        self._Path = Path
+
+    def __call__(self, Name: str) -> _RecordingAspenNode:
+        start = time.perf_counter()
+        Node = self._Collection(Name)
+        Path = _JoinPath(self._Path, Name)
+        self._Recorder.Log("E", Path, time.perf_counter() - start)
+        return _RecordingAspenNode(self._Recorder, Node, Path)
+
+    Item = __call__
+
+    def __iter__(self):
+        start = time.perf_counter()
+        Nodes = [Node for Node in self._Collection]
+        Names = [Node.Name for Node in Nodes]
+        self._Recorder.Log("L", self._Path, Names, time.perf_counter() - start)
+        return iter([_RecordingAspenNode(self._Recorder, Node, _JoinPath(self._Path, Name)) for Node, Name in zip(Nodes, Names)])
+
+    @property
+    def Count(self) -> int:
+        return len(list(self))
+
+
+class ReplayAspenDocument():
+    """Serves a recorded trace as an Aspen document, deterministically and without Aspen (e.g. on Linux)
+
+    Values are replayed per run epoch (the reads recorded between two Run2() calls), in recorded order per path;
+    extra reads repeat the last value, and values written during the replay are served back until the next run.
+    The replay therefore tolerates code that reads less or in another order than the recorded session did.
+
+    Args:
+        TracePath: Trace file written by RecordingAspenDocument.SaveTrace()
+        Latency: "zero" to answer immediately, "recorded" to sleep the recorded time of each run, read and traversal
+    """
+
+    def __init__(self, TracePath: str, Latency: Literal["zero", "recorded"] = "zero"):
+        self.Latency = Latency
+        self.Reads = {}             # (Epoch, Path) -> list of (Value, Seconds)
+        self.Listings = {}          # Path -> (Names, Seconds)
+        self.Traversals = {}        # Path -> Seconds
+        self.NodeAttributes = {}    # (Path, Attribute) -> Value
+        self.DocumentAttributes = {}
+        self.RunTimes = []
+        self.Epoch = 0
+        self.Written = {}           # Path -> Value written during the current epoch of the replay
+        self._ReadCursor = {}
+        self.Stats = {"Run2": 0, "Reads": 0, "Writes": 0, "Traversals": 0, "Listings": 0}
+        Epoch = 0
+        with gzip.open(TracePath, "rt", encoding="utf-8") as TraceFile:
+            for Line in TraceFile:
+                Event = json.loads(Line)
+                Kind = Event[0]
+                if Kind == "G":
+                    self.Reads.setdefault((Epoch, Event[1]), []).append((Event[2], Event[3]))
+                elif Kind == "L":
+                    self.Listings[Event[1]] = (Event[2], Event[3])
+                elif Kind == "E":
+                    self.Traversals[Event[1]] = Event[2]
+                elif Kind in ("A", "N"):
+                    self.NodeAttributes[(Event[1], Event[2])] = Event[3]
+                elif Kind == "D":
+                    self.DocumentAttributes[Event[1]] = Event[2]
+                elif Kind == "R":
+                    self.RunTimes.append(Event[1])
+                    Epoch += 1
+        self.Tree = _ReplayAspenNode(self, "")
+        self.Engine = _MockAspenEngine(self)
+
+    def _Sleep(self, Seconds: float) -> None:
+        if self.Latency == "recorded" and Seconds:
+            time.sleep(Seconds)
+
+    def Read(self, Path: str):
+        self.Stats["Reads"] += 1
+        if Path in self.Written:
+            return self.Written[Path]
+        Values = self.Reads.get((self.Epoch, Path))
+        if Values:
+            Cursor = self._ReadCursor.get((self.Epoch, Path), 0)
+            Value, Seconds = Values[min(Cursor, len(Values) - 1)]
+            self._ReadCursor[(self.Epoch, Path)] = Cursor + 1
+            self._Sleep(Seconds)
+            return Value
+        for Epoch in range(min(self.Epoch, len(self.RunTimes)), -1, -1):
+            Values = self.Reads.get((Epoch, Path))
+            if Values:
+                self._Sleep(Values[-1][1])
+                return Values[-1][0]
+        raise KeyError(f"Path {Path} was never read in the recorded session")
+
+    def Write(self, Path: str, Value) -> None:
+        self.Stats["Writes"] += 1
+        self.Written[Path] = Value
+
+    def Run2(self) -> None:
+        self.Stats["Run2"] += 1
+        if self.Epoch < len(self.RunTimes):
+            self._Sleep(self.RunTimes[self.Epoch])
+        self.Epoch += 1
+        self.Written = {}
+
+    def InitFromArchive2(self, AspenFilePath: str) -> None:
+        pass
+
+    def Stop(self) -> None:
+        pass
+
+    def Reinit(self) -> None:
+        pass
+
+    def Save(self) -> None:
+        pass
+
+    def Close(self, AspenFilePath: str = None) -> None:
+        pass
+
+    def __getattr__(self, Attribute: str):
+        try:
+            return self.__dict__["DocumentAttributes"][Attribute]
+        except KeyError:
+            raise AttributeError(Attribute) from None
+
+
+class _ReplayAspenNode():
+    def __init__(self, Replay: ReplayAspenDocument, Path: str):
+        object.__setattr__(self, "_Replay", Replay)
+        object.__setattr__(self, "_Path", Path)
+
+    @property
+    def Name(self) -> str:
+        return self._Path.rsplit("/", 1)[-1]
+
+    @property
+    def Value(self):
+        return self._Replay.Read(self._Path)
+
+    @Value.setter
+    def Value(self, Value) -> None:
+        self._Replay.Write(self._Path, Value)
+
+    @property
+    def Elements(self) -> "_ReplayAspenCollection":
+        return _ReplayAspenCollection(self._Replay, self._Path)
+
+    def __getattr__(self, Attribute: str):
+        try:
+            return self._Replay.NodeAttributes[(self._Path, Attribute)]
+        except KeyError:
+            raise AttributeError(f"{Attribute} of {self._Path} was never read in the recorded session") from None
+
+
+class _ReplayAspenCollection():
+    def __init__(self, Replay: ReplayAspenDocument, Path: str):
+        self._Replay = Replay
+        self._Path = Path
+
+    def __call__(self, Name: str) -> _ReplayAspenNode:
+        Path = _JoinPath(self._Path, Name)
+        self._Replay.Stats["Traversals"] += 1
+        self._Replay._Sleep(self._Replay.Traversals.get(Path, 0.0))
+        return _ReplayAspenNode(self._Replay, Path)
+
+    Item = __call__
+
+    def _Names(self):
+        try:
+            Names, Seconds = self._Replay.Listings[self._Path]
+        except KeyError:
+            raise KeyError(f"Elements of {self._Path} were never enumerated in the recorded session") from None
+        self._Replay.Stats["Listings"] += 1
+        self._Replay._Sleep(Seconds)
+        return Names
+
+    def __iter__(self):
+        return iter([_ReplayAspenNode(self._Replay, _JoinPath(self._Path, Name)) for Name in self._Names()])
+
+    @property
+    def Count(self) -> int:
+        return len(self._Names())
+
+
+
+
+###########################################################################################################################################
+#####
+############# Negative cache of non-converging design regions: skip candidates close to known failures ##########
+#####
+###########################################################################################################################################
+
+class FailureMap():
+    """Remembers which designs converged and which did not, and rates new candidates by their nearby failures
+
+    Designs are scaled per variable and bucketed in a grid of cells of size Radius, so a query only looks at the
+    points of the occupied neighbouring cells. The failure probability of a candidate is the Gaussian-weighted
+    share of failures among the recorded designs within Radius, with a prior of PriorWeight converged designs,
+    so that a single failure does not blacklist a neighbourhood. With the defaults a candidate is skipped from
+    two failures close to it (2/3 > RiskThreshold) on, while one failure alone (1/2) is not enough.
+
+    Args:
+        Scale: Dictionary of variable name -> typical range, used to make the variables comparable, defaults to
+            RADFRAC_INTERNALS_SCALE (e.g. pass Sim.BaselineInputs[Blockname] for the values of another archive)
+        Radius: Neighbourhood radius in scaled units, i.e. relative to Scale
+        RiskThreshold: Failure probability above which a candidate is skipped
+        Penalty: % flooding reported for TOP and BOT of skipped candidates
+        PriorWeight: Weight of the optimistic (converged) prior
+        AttemptsPerFailure: Solver runs a failing design costs (Run() tries twice)
+    """
+
+    def __init__(self, Scale: Dict[str, float] = None, Radius: float = 0.1, RiskThreshold: float = 0.5,
+                 Penalty: float = 1000.0, PriorWeight: float = 1.0, AttemptsPerFailure: int = 2):
+        Scale = dict(RADFRAC_INTERNALS_SCALE, **(Scale or {}))
+        self.Scale = np.array([abs(float(Scale[Name])) or 1.0 for Name in RADFRAC_INTERNALS_INPUTS])
+        self.Radius = Radius
+        self.RiskThreshold = RiskThreshold
+        self.Penalty = Penalty
+        self.PriorWeight = PriorWeight
+        self.AttemptsPerFailure = AttemptsPerFailure
+        # Preallocated, doubled when full; Points, Failed and CellKeys are the filled parts
+        self._Points = np.empty((64, len(RADFRAC_INTERNALS_INPUTS)))
+        self._Failed = np.empty(64, dtype=bool)
+        self._CellKeys = np.empty((64, len(RADFRAC_INTERNALS_INPUTS)), dtype=np.int64)
+        self._Count = 0
+        self.Cells = {}                 # grid cell -> list of point indexes
+        self.Episode = 0
+        self.EpisodeSkipped = 0
+        self.EpisodeRecordedFailures = 0
+        self.EpisodeReports = []
+
+    @property
+    def Points(self) -> np.ndarray:
+        return self._Points[:self._Count]
+
+    @property
+    def Failed(self) -> np.ndarray:
+        return self._Failed[:self._Count]
+
+    @property
+    def CellKeys(self) -> np.ndarray:
+        return self._CellKeys[:len(self.Cells)]
+
+    @staticmethod
+    def _Grown(Array: np.ndarray, Size: int) -> np.ndarray:
+        if Size <= len(Array):
+            return Array
+        Grown = np.empty((2 * len(Array),) + Array.shape[1:], dtype=Array.dtype)
+        Grown[:len(Array)] = Array
+        return Grown
+
+    def _Scaled(self, Dictionary: Dict[str, Union[str,float,int]]) -> np.ndarray:
+        return DesignToVector(Dictionary) / self.Scale
+
+    def _Cell(self, Point: np.ndarray) -> tuple:
+        # Variables that are not given (NaN) all fall in cell 0
+        return tuple(np.floor(np.nan_to_num(Point) / self.Radius).astype(np.int64))
+
+    def Record(self, Dictionary: Dict[str, Union[str,float,int]], Converged: bool) -> None:
+        """Adds an evaluated design and whether it converged"""
+        Point = self._Scaled(Dictionary)
+        Cell = self._Cell(Point)
+        if Cell not in self.Cells:
+            self._CellKeys = self._Grown(self._CellKeys, len(self.Cells) + 1)
+            self._CellKeys[len(self.Cells)] = Cell
+            self.Cells[Cell] = []
+        self._Points = self._Grown(self._Points, self._Count + 1)
+        self._Failed = self._Grown(self._Failed, self._Count + 1)
+        self._Points[self._Count] = Point
+        self._Failed[self._Count] = not Converged
+        self.Cells[Cell].append(self._Count)
+        self._Count += 1
+        if not Converged:
+            self.EpisodeRecordedFailures += 1
+
+    def FailureProbability(self, Dictionary: Dict[str, Union[str,float,int]]) -> float:
+        """Estimated probability that the design does not converge, from the recorded designs within Radius"""
+        if not len(self.Failed):
+            return 0.0
+        Point = self._Scaled(Dictionary)
+        Cell = np.array(self._Cell(Point), dtype=np.int64)
+        Near = np.all(np.abs(self.CellKeys - Cell) <= 1, axis=1)
+        Indexes = [Index for Key in self.CellKeys[Near] for Index in self.Cells[tuple(Key)]]
+        if not Indexes:
+            return 0.0
+        Distance = np.linalg.norm(np.nan_to_num(self.Points[Indexes] - Point), axis=1)
+        Weight = np.where(Distance <= self.Radius, np.exp(-(Distance / self.Radius) ** 2), 0.0)
+        Failures = Weight[self.Failed[Indexes]].sum()
+        return float(Failures / (Weight.sum() + self.PriorWeight))
+
+    def ShouldSkip(self, Dictionary: Dict[str, Union[str,float,int]]) -> bool:
+        """True if the design is too likely to fail to be worth a solver run, counts the avoided runs"""
+        if self.FailureProbability(Dictionary) > self.RiskThreshold:
+            self.EpisodeSkipped += 1
+            return True
+        return False
+
+    def PenaltyResult(self) -> Dict[str, Union[bool,float]]:
+        """Result of a skipped design, with the same keys as Simulation.BLK_RADFRAC_EVALUATE_DESIGN"""
+        return {"Converged":False, "TopMaxFlooding":self.Penalty, "BotMaxFlooding":self.Penalty, "RunTime":0.0, "Skipped":True, "Fidelity":None}
+
+    def EndEpisode(self) -> Dict[str, int]:
+        """Closes the current episode and returns its report of skipped candidates and avoided solver runs"""
+        Report = {
+            "Episode":self.Episode,
+            "SkippedCandidates":self.EpisodeSkipped,
+            "AvoidedFailingRuns":self.EpisodeSkipped * self.AttemptsPerFailure,
+            "RecordedFailures":self.EpisodeRecordedFailures,
+            "KnownFailures":int(self.Failed.sum()),
+            "KnownDesigns":len(self.Failed)
+        }
+        self.EpisodeReports.append(Report)
+        self.Episode += 1
+        self.EpisodeSkipped = 0
+        self.EpisodeRecordedFailures = 0
+        return Report
+
+
+
+
+###########################################################################################################################################
+#####
+############# Live metrics of long-running sweeps: Prometheus text over HTTP and a rolling summary file ##########
+#####
+###########################################################################################################################################
+
+class SimulationMetrics():
+    """In-process counters, gauges and histograms of a sweep, exported in Prometheus text format
+
+    Simulations given this object as Metrics count run attempts, retries, converged/failed runs, solver seconds
+    and OutputSnapshot/FailureMap hits and misses. The training loop adds EpisodeDone(Reward) per episode. Derived
+    gauges (episodes/s, convergence rate, retry rate, hit rate per cache) are computed when the metrics are exported.
+
+    Args:
+        Buckets: Upper bounds in seconds of the solver runtime histogram buckets
+    """
+    DefaultBuckets = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+    def __init__(self, Buckets = DefaultBuckets):
+        self.Buckets = tuple(Buckets)
+        self.Counters = {}          # (Name, Labels) -> value
+        self.Gauges = {}            # (Name, Labels) -> value
+        self.Histograms = {}        # Name -> [bucket counts..., +Inf count], sum
+        self.StartTime = time.time()
+        self.BestReward = None
+        self._Lock = threading.Lock()
+        self._Server = None
+        self._SummaryStop = None
+
+    @staticmethod
+    def _Key(Name: str, Labels: Dict[str, str]) -> tuple:
+        return Name, tuple(sorted(Labels.items()))
+
+    def Inc(self, Name: str, Amount: float = 1, **Labels) -> None:
+        Key = self._Key(Name, Labels)
+        with self._Lock:
+            self.Counters[Key] = self.Counters.get(Key, 0) + Amount
+
+    def Set(self, Name: str, Value: float, **Labels) -> None:
+        with self._Lock:
+            self.Gauges[self._Key(Name, Labels)] = Value
+
+    def Observe(self, Name: str, Value: float) -> None:
+        with self._Lock:
+            Counts, Sum = self.Histograms.get(Name, ([0] * (len(self.Buckets) + 1), 0.0))
+            for i, Bound in enumerate(self.Buckets):
+                if Value <= Bound:
+                    Counts[i] += 1
+            Counts[-1] += 1
+            self.Histograms[Name] = (Counts, Sum + Value)
+
+    def EpisodeDone(self, Reward: float = None) -> None:
+        """Counts a finished episode and keeps the best reward so far"""
+        self.Inc("aspen_episodes_total")
+        if Reward is not None:
+            with self._Lock:
+                if self.BestReward is None or Reward > self.BestReward:
+                    self.BestReward = float(Reward)
+
+    def _Counter(self, Name: str, **Labels) -> float:
+        return self.Counters.get(self._Key(Name, Labels), 0)
+
+    def Summary(self) -> Dict[str, float]:
+        """Returns the derived rates and totals of the sweep"""
+        with self._Lock:
+            Elapsed = max(time.time() - self.StartTime, 1e-9)
+            Runs = self._Counter("aspen_runs_total")
+            Attempts = self._Counter("aspen_run_attempts_total")
+            Lookups = {}            # Cache label -> [hits, misses]
+            for (Name, Labels), Value in self.Counters.items():
+                if Name in ("aspen_cache_hits_total", "aspen_cache_misses_total"):
+                    Cache = dict(Labels).get("Cache")
+                    Lookups.setdefault(Cache, [0, 0])[Name == "aspen_cache_misses_total"] += Value
+            Counts, Sum = self.Histograms.get("aspen_run_attempt_seconds", ([0], 0.0))
+            return {
+                "ElapsedSeconds":Elapsed,
+                "Episodes":self._Counter("aspen_episodes_total"),
+                "EpisodesPerSecond":self._Counter("aspen_episodes_total") / Elapsed,
+                "Runs":Runs,
+                "ConvergenceRate":self._Counter("aspen_runs_converged_total") / Runs if Runs else None,
+                "RetryRate":self._Counter("aspen_run_retries_total") / Attempts if Attempts else None,
+                "MeanRunSeconds":Sum / Counts[-1] if Counts[-1] else None,
+                "CacheHitRates":{Cache: Hits / (Hits + Misses) for Cache, (Hits, Misses) in sorted(Lookups.items())},
+                "BestReward":self.BestReward
+            }
+
+    @staticmethod
+    def _Labels(Labels: tuple, Extra: str = "") -> str:
+        Items = [f'{Key.lower()}="{Value}"' for Key, Value in Labels] + ([Extra] if Extra else [])
+        return "{" + ",".join(Items) + "}" if Items else ""
+
+    def PrometheusText(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format"""
+        Lines = []
+        Summary = self.Summary()
+        with self._Lock:
+            for Name in sorted({Name for Name, Labels in self.Counters}):
+                Lines.append(f"# TYPE {Name} counter")
+                for (CounterName, Labels), Value in sorted(self.Counters.items()):
+                    if CounterName == Name:
+                        Lines.append(f"{Name}{self._Labels(Labels)} {Value}")
+            for Name, (Counts, Sum) in sorted(self.Histograms.items()):
+                Lines.append(f"# TYPE {Name} histogram")
+                for Bound, Count in zip(self.Buckets, Counts):
+                    Lines.append(f'{Name}_bucket{{le="{Bound}"}} {Count}')
+                Lines.append(f'{Name}_bucket{{le="+Inf"}} {Counts[-1]}')
+                Lines.append(f"{Name}_sum {Sum}")
+                Lines.append(f"{Name}_count {Counts[-1]}")
+            Gauges = dict(self.Gauges)
+        for Name, Key in (("aspen_episodes_per_second", "EpisodesPerSecond"), ("aspen_convergence_rate", "ConvergenceRate"),
+                          ("aspen_retry_rate", "RetryRate"), ("aspen_best_reward", "BestReward")):
+            if Summary[Key] is not None:
+                Gauges[(Name, ())] = Summary[Key]
+        for Cache, Rate in Summary["CacheHitRates"].items():
+            Gauges[self._Key("aspen_cache_hit_rate", {"Cache":Cache})] = Rate
+        for Name in sorted({Name for Name, Labels in Gauges}):
+            Lines.append(f"# TYPE {Name} gauge")
+            for (GaugeName, Labels), Value in sorted(Gauges.items()):
+                if GaugeName == Name:
+                    Lines.append(f"{Name}{self._Labels(Labels)} {Value}")
+        return "\n".join(Lines) + "\n"
+
+    def Serve(self, Port: int = 9108, Host: str = "127.0.0.1") -> tuple:
+        """Serves the metrics at http://Host:Port/metrics from a background thread, returns the bound address"""
+        Metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                Body = Metrics.PrometheusText().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(Body)))
+                self.end_headers()
+                self.wfile.write(Body)
+
+            def log_message(self, *Args):
+                pass        # No request logging into the notebook cells
+
+        self._Server = ThreadingHTTPServer((Host, Port), Handler)
+        threading.Thread(target=self._Server.serve_forever, daemon=True).start()
+        return self._Server.server_address[:2]
+
+    def WriteSummary(self, SummaryPath: str) -> None:
+        """Atomically rewrites the summary file with the current Summary() as JSON"""
+        TempPath = SummaryPath + ".tmp"
+        with open(TempPath, "w") as SummaryFile:
+            json.dump(self.Summary(), SummaryFile, indent=1)
+        os.replace(TempPath, SummaryPath)
+
+    def StartSummaryWriter(self, SummaryPath: str, Interval: float = 60.0) -> None:
+        """Rewrites the summary file every Interval seconds from a background thread"""
+        self._SummaryStop = threading.Event()
+
+        def Write():
+            while not self._SummaryStop.wait(Interval):
+                self.WriteSummary(SummaryPath)
+        threading.Thread(target=Write, daemon=True).start()
+
+    def Stop(self) -> None:
+        """Stops the HTTP endpoint and the summary writer"""
+        if self._Server is not None:
+            self._Server.shutdown()
+            self._Server.server_close()
+            self._Server = None
+        if self._SummaryStop is not None:
+            self._SummaryStop.set()
+            self._SummaryStop = None
+
+
+
+
+###########################################################################################################################################
+#####
+############# Automatic engine recycling: restart Aspen after N runs or on latency drift / memory growth ##########
+#####
+###########################################################################################################################################
+
+ASPEN_PROCESS_NAMES = ("AspenPlus.exe", "apmain.exe")
+_EngineStartLock = threading.Lock()
+
+
+def _AspenProcessIds() -> set:
+    """Returns the ids of the running Aspen engine processes, an empty set without psutil"""
+    if psutil is None:
+        return set()
+    return {Process.pid for Process in psutil.process_iter(["name"]) if Process.info["name"] in ASPEN_PROCESS_NAMES}
+
+
+def AspenEngineMemoryMB(Sim: Simulation) -> float:
+    """Returns the resident memory in MB of the engine of one Simulation, None if it is not known
+
+    The engine processes are the Aspen processes that appeared while the Simulation dispatched its document
+    (Sim.EngineProcessIds) and their children. Engines started by other Python processes at the same moment may
+    be counted too, and documents passed in as AspenDocument have no known processes: in both cases give the
+    EngineSupervisor a MemoryFunction that measures the engine in another way.
+
+    Args:
+        Sim: Simulation whose engine is measured
+    """
+    if psutil is None or not Sim.EngineProcessIds:
+        return None
+    Processes = {}
+    for ProcessId in Sim.EngineProcessIds:
+        try:
+            Process = psutil.Process(ProcessId)
+            for Member in [Process] + Process.children(recursive=True):
+                Processes[Member.pid] = Member
+        except psutil.Error:        # The process has exited
+            continue
+    Total = 0
+    for Process in Processes.values():
+        try:
+            Total += Process.memory_info().rss
+        except psutil.Error:
+            continue
+    return Total / 2 ** 20
+
+
+class EngineSupervisor():
+    """Drop-in wrapper of a Simulation that recycles the Aspen engine before it degrades
+
+    The supervisor forwards every attribute to the current Simulation. Before each Run() it checks the number of
+    runs since the last start, the drift of the recent run latency against the latency right after the start, and
+    the memory of the engine; if a limit is crossed it reads the current internals inputs of the Blocks, closes
+    Aspen, starts a new Simulation from SimulationFactory and restores the inputs, so the training loop carries on.
+
+    Args:
+        SimulationFactory: Callable returning a new, loaded Simulation (e.g. with ChangeDirectory=False)
+        Blocknames: List of RadFrac Block names whose inputs are carried over to the new engine
+        MaxRuns: Runs after which the engine is recycled, None for no limit
+        LatencyWindow: Number of runs of the reference (after start) and of the recent latency medians
+        LatencyDriftFactor: Recycle when the recent median latency exceeds this factor times the reference
+        MaxMemoryMB: Recycle when MemoryFunction(Sim) exceeds this many MB, None for no limit
+        MemoryFunction: Callable of the supervised Simulation returning the memory in MB of its own engine (not of
+            all the Aspen processes of the host, or every supervisor would recycle at once), defaults to AspenEngineMemoryMB
+        MemoryCheckInterval: Runs between two memory checks
+    """
+
+    def __init__(self, SimulationFactory, Blocknames, MaxRuns: int = 500, LatencyWindow: int = 20, LatencyDriftFactor: float = 2.0,
+                 MaxMemoryMB: float = None, MemoryFunction = AspenEngineMemoryMB, MemoryCheckInterval: int = 10):
+        object.__setattr__(self, "SimulationFactory", SimulationFactory)
+        object.__setattr__(self, "Blocknames", list(Blocknames))
+        object.__setattr__(self, "MaxRuns", MaxRuns)
+        object.__setattr__(self, "LatencyWindow", LatencyWindow)
+        object.__setattr__(self, "LatencyDriftFactor", LatencyDriftFactor)
+        object.__setattr__(self, "MaxMemoryMB", MaxMemoryMB)
+        object.__setattr__(self, "MemoryFunction", MemoryFunction)
+        object.__setattr__(self, "MemoryCheckInterval", MemoryCheckInterval)
+        object.__setattr__(self, "Recycles", [])            # list of (run count at recycle, reason)
+        object.__setattr__(self, "TotalRuns", 0)
+        self._Start(SimulationFactory())
+
+    def _Start(self, Sim: Simulation) -> None:
+        object.__setattr__(self, "Sim", Sim)
+        object.__setattr__(self, "RunsSinceStart", 0)
+        object.__setattr__(self, "Latencies", [])
+
+    def __getattr__(self, Attribute: str):
+        return getattr(self.Sim, Attribute)
+
+    def __setattr__(self, Attribute: str, Value) -> None:
+        setattr(self.Sim, Attribute, Value)
+
+    def RecycleReason(self) -> str:
+        """Returns why the engine should be recycled now, None if it is healthy"""
+        if self.MaxRuns is not None and self.RunsSinceStart >= self.MaxRuns:
+            return "runs"
+        if len(self.Latencies) >= 2 * self.LatencyWindow:
+            Reference = np.median(self.Latencies[:self.LatencyWindow])
+            Recent = np.median(self.Latencies[-self.LatencyWindow:])
+            if Recent > self.LatencyDriftFactor * Reference:
+                return "latency"
+        if (self.MaxMemoryMB is not None and self.RunsSinceStart and self.RunsSinceStart % self.MemoryCheckInterval == 0):
+            MemoryMB = self.MemoryFunction(self.Sim)
+            if MemoryMB is not None and MemoryMB > self.MaxMemoryMB:
+                return "memory"
+        return None
+
+    def Recycle(self, Reason: str = "manual") -> None:
+        """Restarts the engine and restores the current design inputs and the settings of the Simulation
+
+        The new engine is started before the old one is closed, so if SimulationFactory raises (e.g. no license
+        available) the error is passed on and the supervisor keeps working on the old engine.
+        """
+        Old = self.Sim
+        Inputs = {Blockname: Old.BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK(Blockname) for Blockname in self.Blocknames}
+        New = self.SimulationFactory()
+        Old.CloseAspen()
+        New.QUIET = Old.QUIET
+        New.Metrics = Old.Metrics
+        New.TreeIndex = Old.TreeIndex
+        New.SnapshotBlocks = dict(Old.SnapshotBlocks)
+        New.BaselineInputs = dict(Old.BaselineInputs)
+        New.FidelityBaseline = dict(Old.FidelityBaseline)
+        for Blockname, Fidelity in Old.Fidelity.items():
+            New.SetFidelity(Blockname, Fidelity)
+        for Blockname, Dictionary in Inputs.items():
+            New.BLK_RADFRAC_SET_ALL_INPUTS(Blockname, Dictionary)
+        self.Recycles.append((self.TotalRuns, Reason))
+        if New.Metrics is not None:
+            New.Metrics.Inc("aspen_engine_recycles_total", Reason=Reason)
+        self._Start(New)
+
+    def Run(self, *Args, **Kwargs) -> bool:
+        """Same as Simulation.Run(), recycling the engine first if needed"""
+        Reason = self.RecycleReason()
+        if Reason is not None:
+            try:
+                self.Recycle(Reason)
+            except Exception:
+                # Carry on with the old engine, the recycle is tried again before the next run
+                if self.Sim.Metrics is not None:
+                    self.Sim.Metrics.Inc("aspen_engine_recycle_failures_total", Reason=Reason)
+        start = time.time()
+        Converged = self.Sim.Run(*Args, **Kwargs)
+        self.Latencies.append(time.time() - start)
+        object.__setattr__(self, "RunsSinceStart", self.RunsSinceStart + 1)
+        object.__setattr__(self, "TotalRuns", self.TotalRuns + 1)
+        return Converged
+
+    def BLK_RADFRAC_EVALUATE_DESIGN(self, *Args, **Kwargs) -> Dict[str, Union[bool,float]]:
+        # Bound to the supervisor so that the evaluation runs through Run() above
+        return Simulation.BLK_RADFRAC_EVALUATE_DESIGN(self, *Args, **Kwargs)
+
+
+
+
+###########################################################################################################################################
+#####
+############# Local engine pool, finite-difference sensitivity and bounded refinement of a final design ##########
+#####
+###########################################################################################################################################
+
+def _DesignKey(Dictionary: Dict[str, Union[str,float,int]], Digits: int = 10) -> tuple:
+    return tuple(None if math.isnan(Value) else round(Value, Digits) for Value in DesignToVector(Dictionary))
+
+
+class SimulationEnginePool():
+    """Evaluates batches of designs concurrently on several local Aspen engines, with a cache of evaluations
+
+    Each engine lives in its own worker thread, which creates its Simulation with SimulationFactory (so the COM
+    document belongs to that thread) and evaluates designs from a shared queue. The engines do not share any state,
+    so every design is completed with BaseDesign and must then give all internals inputs, else the result would
+    depend on the design the engine ran before. Results of designs evaluated before are served from Cache.
+
+    Args:
+        SimulationFactory: Callable returning a new, loaded Simulation (e.g. with ChangeDirectory=False, QUIET=True)
+        Blockname: String which gives the name of the RadFrac Block
+        NumberOfEngines: Number of worker threads/engines
+        BaseDesign: Optional design Dictionary with the inputs that the designs leave out, e.g. the frozen inputs
+            of a DesignConfiguration or the baseline inputs of the archive
+    """
+
+    def __init__(self, SimulationFactory, Blockname: str, NumberOfEngines: int = 4, BaseDesign: Dict[str, float] = None):
+        self.Blockname = Blockname
+        self.BaseDesign = dict(BaseDesign or {})
+        self.Cache = {}                     # design key -> result Dictionary
+        self.Work = queue.Queue()
+        self.Threads = []
+        Ready = queue.Queue()
+        for _ in range(NumberOfEngines):
+            Thread = threading.Thread(target=self._Worker, args=(SimulationFactory, Ready), daemon=True)
+            Thread.start()
+            self.Threads.append(Thread)
+        for _ in range(NumberOfEngines):
+            Error = Ready.get()
+            if Error is not None:
+                self.Close()
+                raise Error
+
+    def _Worker(self, SimulationFactory, Ready: "queue.Queue") -> None:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            Sim = SimulationFactory()
+        except Exception as Error:
+            Ready.put(Error)
+            return
+        Ready.put(None)
+        while True:
+            Item = self.Work.get()
+            if Item is None:
+                break
+            Design, Done = Item
+            try:
+                Done.put((Design, Sim.BLK_RADFRAC_EVALUATE_DESIGN(self.Blockname, Design)))
+            except Exception as Error:
+                Done.put((Design, Error))
+        Sim.CloseAspen()
+
+    def EvaluateBatch(self, Designs, UseCache: bool = True, Parallel: bool = True) -> list:
+        """Evaluates a list of design Dictionaries, returns the result Dictionaries in the same order
+
+        Args:
+            Designs: List of design Dictionaries
+            UseCache: Serve designs evaluated before from the Cache (and skip duplicates within the batch)
+            Parallel: If False the designs are dispatched one at a time, for wall-clock comparisons
+        """
+        Designs = [dict(self.BaseDesign, **Design) for Design in Designs]
+        for Design in Designs:
+            Missing = [Name for Name in RADFRAC_INTERNALS_INPUTS if Design.get(Name) is None]
+            if Missing:
+                raise ValueError(f"Design misses the internals inputs {Missing}, give them or a BaseDesign")
+        Keys = [_DesignKey(Design) for Design in Designs]
+        Pending = {}
+        for Key, Design in zip(Keys, Designs):
+            if not (UseCache and Key in self.Cache) and Key not in Pending:
+                Pending[Key] = Design
+        Done = queue.Queue()
+        Results = {}
+        if Parallel:
+            for Design in Pending.values():
+                self.Work.put((Design, Done))
+            Outcomes = [Done.get() for _ in Pending]
+        else:
+            Outcomes = []
+            for Design in Pending.values():
+                self.Work.put((Design, Done))
+                Outcomes.append(Done.get())
+        for Design, Result in Outcomes:
+            if isinstance(Result, Exception):
+                raise Result
+            Results[_DesignKey(Design)] = Result
+            self.Cache[_DesignKey(Design)] = Result
+        return [Results.get(Key, self.Cache.get(Key)) for Key in Keys]
+
+    def Close(self) -> None:
+        for _ in self.Threads:
+            self.Work.put(None)
+        for Thread in self.Threads:
+            Thread.join()
+        self.Threads = []
+
+
+def FloodingTargetObjective(Result: Dict[str, Union[bool,float]], TargetFlooding: float = 80.0) -> float:
+    """Squared distance of TOP and BOT Maximum % flooding to the target, infinite if the run did not converge"""
+    if not Result["Converged"]:
+        return math.inf
+    return (Result["TopMaxFlooding"] - TargetFlooding) ** 2 + (Result["BotMaxFlooding"] - TargetFlooding) ** 2
+
+
+def _PerturbedDesigns(Design: Dict[str, float], Variables, Steps) -> list:
+    Designs = []
+    for Name, Step in zip(Variables, Steps):
+        Designs.append(dict(Design, **{Name: Design[Name] + Step}))
+        Designs.append(dict(Design, **{Name: Design[Name] - Step}))
+    return Designs
+
+
+def DesignSensitivity(Pool: SimulationEnginePool, Design: Dict[str, float], Variables = None, RelativeStep: float = 0.01,
+                      Objective = FloodingTargetObjective, UseCache: bool = True, Parallel: bool = True) -> dict:
+    """Central finite-difference Jacobian of TOP/BOT Maximum % flooding (and of Objective) to the internals inputs
+
+    The baseline and the 2 x len(Variables) perturbed designs are dispatched as one batch over the engine pool.
+
+    Args:
+        Pool: SimulationEnginePool evaluating the designs
+        Design: Full design Dictionary around which the derivatives are taken
+        Variables: Names of the perturbed inputs, defaults to all inputs given in Design
+        RelativeStep: Perturbation relative to the value of each input
+        Objective: Callable of a result Dictionary whose gradient is returned too
+    Returns:
+        Dictionary with Variables, Steps, Jacobian (2 x n, rows TOP and BOT), ObjectiveGradient, Baseline, WallTime
+    """
+    Variables = [Name for Name in RADFRAC_INTERNALS_INPUTS if Design.get(Name) is not None] if Variables is None else list(Variables)
+    Steps = [RelativeStep * max(abs(Design[Name]), 1e-6) for Name in Variables]
+    start = time.time()
+    Results = Pool.EvaluateBatch([Design] + _PerturbedDesigns(Design, Variables, Steps), UseCache=UseCache, Parallel=Parallel)
+    WallTime = time.time() - start
+    Baseline, Plus, Minus = Results[0], Results[1::2], Results[2::2]
+    Jacobian = np.array([[(P[Output] - M[Output]) / (2 * Step) for P, M, Step in zip(Plus, Minus, Steps)]
+                         for Output in ("TopMaxFlooding", "BotMaxFlooding")])
+    ObjectiveGradient = np.array([(Objective(P) - Objective(M)) / (2 * Step) for P, M, Step in zip(Plus, Minus, Steps)])
+    return {"Variables":Variables, "Steps":Steps, "Jacobian":Jacobian, "ObjectiveGradient":ObjectiveGradient,
+            "Baseline":Baseline, "WallTime":WallTime}
+
+
+def SensitivityWallClock(Pool: SimulationEnginePool, Design: Dict[str, float], **Kwargs) -> Dict[str, float]:
+    """Wall-clock seconds of the same Jacobian dispatched concurrently and one design at a time (without the Cache)"""
+    Parallel = DesignSensitivity(Pool, Design, UseCache=False, Parallel=True, **Kwargs)["WallTime"]
+    Sequential = DesignSensitivity(Pool, Design, UseCache=False, Parallel=False, **Kwargs)["WallTime"]
+    return {"Parallel":Parallel, "Sequential":Sequential, "Speedup":Sequential / Parallel}
+
+
+def RefineDesign(Pool: SimulationEnginePool, Design: Dict[str, float], Lower: Dict[str, float], Upper: Dict[str, float],
+                 Variables = None, Objective = FloodingTargetObjective, Iterations: int = 10, Radius: float = 0.05,
+                 MinRadius: float = 1e-3, RelativeStep: float = 0.01) -> dict:
+    """Bounded local refinement of a design with a projected-gradient trust region on top of DesignSensitivity
+
+    Each iteration takes the objective gradient in inputs scaled by the starting design, tries steps of Radius,
+    Radius/2, Radius/4 and Radius/8 (relative length) against it in one parallel batch, projects them on the
+    bounds and keeps the best improving one; without improvement the Radius shrinks until it reaches MinRadius.
+
+    Args:
+        Pool: SimulationEnginePool evaluating the designs
+        Design: Full design Dictionary to start from, e.g. the best design of outputs_actions
+        Lower: Dictionary of lower bounds of the Variables
+        Upper: Dictionary of upper bounds of the Variables
+        Variables: Names of the refined inputs, defaults to all inputs given in Design
+        Objective: Callable of a result Dictionary to be minimized
+    Returns:
+        Dictionary with Design, Result, Objective, History (objective per iteration) and WallTime
+    """
+    Variables = [Name for Name in RADFRAC_INTERNALS_INPUTS if Design.get(Name) is not None] if Variables is None else list(Variables)
+    Scale = np.array([max(abs(Design[Name]), 1e-6) for Name in Variables])
+    Low = np.array([Lower[Name] for Name in Variables])
+    High = np.array([Upper[Name] for Name in Variables])
+    start = time.time()
+    Current = dict(Design)
+    Sensitivity = DesignSensitivity(Pool, Current, Variables, RelativeStep, Objective)
+    CurrentResult = Sensitivity["Baseline"]
+    History = [Objective(CurrentResult)]
+    for _ in range(Iterations):
+        if Radius < MinRadius:
+            break
+        Gradient = Sensitivity["ObjectiveGradient"] * Scale
+        Norm = np.linalg.norm(Gradient)
+        if not np.isfinite(Norm) or Norm == 0:
+            break
+        x = np.array([Current[Name] for Name in Variables])
+        Candidates = [dict(Current, **dict(zip(Variables, np.clip(x - Radius * Fraction * Scale * Gradient / Norm, Low, High).tolist())))
+                      for Fraction in (1.0, 0.5, 0.25, 0.125)]
+        Values = [Objective(Result) for Result in Pool.EvaluateBatch(Candidates)]
+        Best = int(np.argmin(Values))
+        if Values[Best] < History[-1]:
+            Current = Candidates[Best]
+            Sensitivity = DesignSensitivity(Pool, Current, Variables, RelativeStep, Objective)
+            CurrentResult = Sensitivity["Baseline"]
+            History.append(Values[Best])
+            if Best == 0:
+                Radius *= 1.5
+        else:
+            Radius /= 8
+    return {"Design":Current, "Result":CurrentResult, "Objective":History[-1], "History":History, "WallTime":time.time() - start}
+
+
+
+
+###########################################################################################################################################
+#####
+############# Multi-fidelity evaluation: cheap screening runs, full runs only for promising candidates ##########
+#####
+###########################################################################################################################################
+
+class FidelityScheduler():
+    """Screens candidates with "low" fidelity runs and promotes only the promising ones to a "high" fidelity run
+
+    A candidate is promising if its screening run converged and its Objective is within the PromoteQuantile best
+    of the screening objectives seen so far; the first WarmupCandidates are always promoted. Every evaluation is
+    kept in Records with the fidelity that produced it, so stored states stay interpretable.
+
+    Args:
+        Sim: Simulation (or EngineSupervisor) evaluating the designs
+        Blockname: String which gives the name of the RadFrac Block
+        Objective: Callable of a result Dictionary, lower is better
+        PromoteQuantile: Share of the best screening objectives that is promoted
+        WarmupCandidates: Number of first candidates that are always promoted
+        FailureMap: Optional FailureMap passed on to the evaluations
+    """
+
+    def __init__(self, Sim: Simulation, Blockname: str, Objective = FloodingTargetObjective, PromoteQuantile: float = 0.25,
+                 WarmupCandidates: int = 10, FailureMap: FailureMap = None):
+        self.Sim = Sim
+        self.Blockname = Blockname
+        self.Objective = Objective
+        self.PromoteQuantile = PromoteQuantile
+        self.WarmupCandidates = WarmupCandidates
+        self.FailureMap = FailureMap
+        self.ScreeningObjectives = []
+        self.Records = []           # Dictionaries of Design, Fidelity, Result and Promoted
+
+    def Promote(self, Result: Dict[str, Union[bool,float,str]]) -> bool:
+        """True if a screening result deserves a full-fidelity run"""
+        Value = self.Objective(Result)
+        self.ScreeningObjectives.append(Value)
+        if not Result["Converged"] or not math.isfinite(Value):
+            return False
+        if len(self.ScreeningObjectives) <= self.WarmupCandidates:
+            return True
+        # Failed screenings score inf and would turn the quantile into nan
+        Finite = [Objective for Objective in self.ScreeningObjectives if math.isfinite(Objective)]
+        return Value <= np.quantile(Finite, self.PromoteQuantile)
+
+    def Evaluate(self, Dictionary: Dict[str, Union[str,float,int]]) -> Dict[str, Union[bool,float,str]]:
+        """Evaluates a candidate design, returns the full-fidelity result if promoted else the screening result"""
+        Screening = self.Sim.BLK_RADFRAC_EVALUATE_DESIGN(self.Blockname, Dictionary, self.FailureMap, Fidelity="low")
+        Promoted = not Screening["Skipped"] and self.Promote(Screening)
+        self.Records.append({"Design":dict(Dictionary), "Fidelity":Screening["Fidelity"], "Result":Screening, "Promoted":Promoted})
+        if not Promoted:
+            return Screening
+        Full = self.Sim.BLK_RADFRAC_EVALUATE_DESIGN(self.Blockname, Dictionary, self.FailureMap, Fidelity="high")
+        self.Records.append({"Design":dict(Dictionary), "Fidelity":Full["Fidelity"], "Result":Full, "Promoted":True})
+        return Full
+
+    def Counts(self) -> Dict[str, int]:
+        """Number of screening and full-fidelity runs so far"""
+        return {"low":sum(Record["Fidelity"] == "low" for Record in self.Records),
+                "high":sum(Record["Fidelity"] == "high" for Record in self.Records)}
+
+
+
+
+###########################################################################################################################################
+#####
+############# Design configuration: which internals inputs are Action vars and which are frozen ##########
+#####
+###########################################################################################################################################
+
+class DesignConfiguration():
+    """Declares the Action vars of a study; frozen internals inputs are written once and never again
+
+    Frozen inputs are set by Setup() and left out of the Action vector and of the per-step COM writes, which
+    shrinks both the action dimension and the writes per episode. E.g. the fixed-diameter study is
+    DesignConfiguration.FixedColumnDiameter("B1", 1.5, 1.5) and the variable-diameter study is DesignConfiguration("B1").
+
+    Args:
+        Blockname: String which gives the name of the RadFrac Block
+        Frozen: Dictionary of frozen input name (see RADFRAC_INTERNALS_INPUTS) -> value written at Setup()
+        ActionNames: Names of the Action vars in Action-vector order, defaults to all non-frozen inputs
+    """
+
+    def __init__(self, Blockname: str, Frozen: Dict[str, float] = None, ActionNames = None):
+        self.Blockname = Blockname
+        self.Frozen = dict(Frozen or {})
+        Unknown = [Name for Name in self.Frozen if Name not in RADFRAC_INTERNALS_INPUTS]
+        if Unknown:
+            raise ValueError(f"Unknown internals inputs: {Unknown}")
+        if ActionNames is None:
+            ActionNames = [Name for Name in RADFRAC_INTERNALS_INPUTS if Name not in self.Frozen]
+        self.ActionNames = list(ActionNames)
+        Overlap = [Name for Name in self.ActionNames if Name in self.Frozen]
+        if Overlap:
+            raise ValueError(f"Inputs cannot be frozen and Action vars at the same time: {Overlap}")
+
+    @classmethod
+    def FixedColumnDiameter(cls, Blockname: str, ColDiam_Top: float, ColDiam_Bot: float, ActionNames = None) -> "DesignConfiguration":
+        """Configuration of the fixed-diameter study: TOP and BOT diameters are frozen"""
+        return cls(Blockname, {"ColDiam_Top": ColDiam_Top, "ColDiam_Bot": ColDiam_Bot}, ActionNames)
+
+    @property
+    def ActionDimension(self) -> int:
+        return len(self.ActionNames)
+
+    def Setup(self, Sim: Simulation) -> None:
+        """Writes the frozen inputs once, call it after loading
+
+        The frozen inputs also become part of the baseline inputs of the Block, so Reset() (e.g. the next seed
+        of AspenEngineManager.Acquire) keeps them instead of restoring the values of the archive.
+        """
+        Sim.BLK_RADFRAC_SET_ALL_INPUTS(self.Blockname, self.Frozen)
+        if self.Blockname in Sim.BaselineInputs:
+            Sim.BaselineInputs[self.Blockname] = dict(Sim.BaselineInputs[self.Blockname], **self.Frozen)
+        else:
+            Sim.CaptureBaselineInputs(self.Blockname)
+
+    def ActionToDesign(self, Action) -> Dict[str, float]:
+        """Design Dictionary of the Action vars only, i.e. what has to be written per step"""
+        Action = np.asarray(Action, dtype=float).ravel()
+        if len(Action) != self.ActionDimension:
+            raise ValueError(f"Action has {len(Action)} values, expected {self.ActionDimension}")
+        return dict(zip(self.ActionNames, Action.tolist()))
+
+    def DesignToAction(self, Dictionary: Dict[str, Union[str,float,int]]) -> np.ndarray:
+        """Action vector of a design Dictionary (e.g. from BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK)"""
+        return np.array([float(Dictionary[Name]) for Name in self.ActionNames])
+
+    def FullDesign(self, Action) -> Dict[str, float]:
+        """Design Dictionary of the Action vars and the frozen inputs"""
+        return dict(self.Frozen, **self.ActionToDesign(Action))
+
+    def Apply(self, Sim: Simulation, Action) -> None:
+        """Writes the Action vars of one step, frozen inputs are not written again"""
+        Sim.BLK_RADFRAC_SET_ALL_INPUTS(self.Blockname, self.ActionToDesign(Action))
+
+    def Evaluate(self, Sim: Simulation, Action, **Kwargs) -> Dict[str, Union[bool,float,str]]:
+        """Same as Simulation.BLK_RADFRAC_EVALUATE_DESIGN for an Action vector, writing the Action vars only"""
+        return Sim.BLK_RADFRAC_EVALUATE_DESIGN(self.Blockname, self.ActionToDesign(Action), **Kwargs)
+
+
+
+
+###########################################################################################################################################
+#####
+############# Array-backed replay buffer shared by parallel simulation workers ##########
+#####
+###########################################################################################################################################
+
+class SharedReplayBuffer():
+    """Fixed-capacity ring buffer of (State, Action, Reward, NextState, Done) transitions in contiguous NumPy arrays
+
+    Sampling is vectorized and costs O(BatchSize) (uniform) or O(BatchSize log Capacity) (prioritized, sum tree),
+    so it stays flat as the capacity grows. Appends and samples are serialized by Lock, so several engine workers
+    (threads, or processes when the buffer is backed by memmap files in Path and given a multiprocessing.Lock) can
+    feed one learner. Open() attaches another process to an existing memmap-backed buffer.
+
+    Args:
+        Capacity: Maximum number of transitions, the oldest are overwritten
+        StateDimension: Length of the State vector (2: TOP and BOT Maximum % flooding)
+        ActionDimension: Length of the Action vector, e.g. DesignConfiguration.ActionDimension
+        Prioritized: Sample proportionally to priority ** Alpha instead of uniformly
+        Alpha: Priority exponent
+        Beta: Importance-sampling exponent of the returned Weights
+        Path: Optional folder of the memmap files, None keeps the arrays in memory
+        Lock: Lock serializing writers, defaults to a threading.Lock
+    """
+
+    def __init__(self, Capacity: int, StateDimension: int, ActionDimension: int, Prioritized: bool = False,
+                 Alpha: float = 0.6, Beta: float = 0.4, Path: str = None, Lock = None, _Mode: str = "w+"):
+        self.Capacity = int(Capacity)
+        self.StateDimension = int(StateDimension)
+        self.ActionDimension = int(ActionDimension)
+        self.Prioritized = Prioritized
+        self.Alpha = Alpha
+        self.Beta = Beta
+        self.Path = Path
+        self.Lock = Lock if Lock is not None else threading.Lock()
+        self.TreeSize = 1 << max(self.Capacity - 1, 1).bit_length()     # leaves of the sum tree, power of 2
+        Shapes = {
+            "States": ((self.Capacity, self.StateDimension), np.float32),
+            "Actions": ((self.Capacity, self.ActionDimension), np.float32),
+            "Rewards": ((self.Capacity,), np.float32),
+            "NextStates": ((self.Capacity, self.StateDimension), np.float32),
+            "Dones": ((self.Capacity,), np.bool_),
+            "Tree": ((2 * self.TreeSize,), np.float64),
+            "Header": ((3,), np.float64),       # position, size, max priority
+        }
+        if Path is not None and _Mode == "w+":
+            os.makedirs(Path, exist_ok=True)
+            with open(os.path.join(Path, "buffer.json"), "w") as MetaFile:
+                json.dump({"Capacity":self.Capacity, "StateDimension":self.StateDimension, "ActionDimension":self.ActionDimension,
+                           "Prioritized":Prioritized, "Alpha":Alpha, "Beta":Beta}, MetaFile)
+        for Name, (Shape, DataType) in Shapes.items():
+            if Path is None:
+                Array = np.zeros(Shape, dtype=DataType)
+            else:
+                Array = np.lib.format.open_memmap(os.path.join(Path, Name + ".npy"), mode=_Mode, dtype=DataType, shape=Shape)
+            setattr(self, Name, Array)
+        if _Mode == "w+":
+            self.Header[:] = (0, 0, 1.0)
+
+    @classmethod
+    def Open(cls, Path: str, Lock = None) -> "SharedReplayBuffer":
+        """Attaches to a memmap-backed buffer created in Path by another process"""
+        with open(os.path.join(Path, "buffer.json")) as MetaFile:
+            Meta = json.load(MetaFile)
+        return cls(Meta["Capacity"], Meta["StateDimension"], Meta["ActionDimension"], Meta["Prioritized"],
+                   Meta["Alpha"], Meta["Beta"], Path, Lock, _Mode="r+")
+
+    def __len__(self) -> int:
+        return int(self.Header[1])
+
+    def _SetPriorities(self, Indexes: np.ndarray, Priorities: np.ndarray) -> None:
+        Nodes = np.asarray(Indexes) + self.TreeSize
+        self.Tree[Nodes] = np.asarray(Priorities, dtype=float) ** self.Alpha
+        Nodes = np.unique(Nodes // 2)
+        while Nodes[0] >= 1:
+            self.Tree[Nodes] = self.Tree[2 * Nodes] + self.Tree[2 * Nodes + 1]
+            if Nodes[0] == 1:
+                break
+            Nodes = np.unique(Nodes // 2)
+
+    def AddBatch(self, States, Actions, Rewards, NextStates, Dones) -> np.ndarray:
+        """Appends transitions (arrays with one row per transition), returns their indexes"""
+        States = np.atleast_2d(np.asarray(States, dtype=np.float32))
+        Count = len(States)
+        with self.Lock:
+            Position, Size, MaxPriority = int(self.Header[0]), int(self.Header[1]), self.Header[2]
+            Indexes = (Position + np.arange(Count)) % self.Capacity
+            self.States[Indexes] = States
+            self.Actions[Indexes] = np.atleast_2d(np.asarray(Actions, dtype=np.float32))
+            self.Rewards[Indexes] = np.asarray(Rewards, dtype=np.float32).ravel()
+            self.NextStates[Indexes] = np.atleast_2d(np.asarray(NextStates, dtype=np.float32))
+            self.Dones[Indexes] = np.asarray(Dones, dtype=np.bool_).ravel()
+            if self.Prioritized:
+                # New transitions get the highest priority seen so far, so they are sampled at least once
+                self._SetPriorities(Indexes, np.full(Count, MaxPriority))
+            self.Header[0] = (Position + Count) % self.Capacity
+            self.Header[1] = min(Size + Count, self.Capacity)
+        return Indexes
+
+    def Add(self, State, Action, Reward: float, NextState, Done: bool) -> int:
+        """Appends one transition, returns its index"""
+        return int(self.AddBatch([State], [Action], [Reward], [NextState], [Done])[0])
+
+    def Sample(self, BatchSize: int, Rng: np.random.Generator = None) -> Dict[str, np.ndarray]:
+        """Draws a batch of transitions, returns arrays of States, Actions, Rewards, NextStates, Dones, Indexes and Weights"""
+        Rng = Rng if Rng is not None else np.random.default_rng()
+        # Under the writers' Lock, so no row or sum-tree node is read half-written by a concurrent AddBatch
+        with self.Lock:
+            return self._Sample(BatchSize, Rng)
+
+    def _Sample(self, BatchSize: int, Rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        Size = len(self)
+        if Size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        if not self.Prioritized:
+            Indexes = Rng.integers(0, Size, BatchSize)
+            Weights = np.ones(BatchSize, dtype=np.float32)
+        else:
+            # Stratified draws, then descend the sum tree for the whole batch at once
+            Total = self.Tree[1]
+            Targets = (np.arange(BatchSize) + Rng.random(BatchSize)) * (Total / BatchSize)
+            Nodes = np.ones(BatchSize, dtype=np.int64)
+            while Nodes[0] < self.TreeSize:
+                Left = 2 * Nodes
+                GoRight = Targets > self.Tree[Left]
+                Targets = np.where(GoRight, Targets - self.Tree[Left], Targets)
+                Nodes = np.where(GoRight, Left + 1, Left)
+            Indexes = np.minimum(Nodes - self.TreeSize, Size - 1)
+            Probabilities = self.Tree[Indexes + self.TreeSize] / Total
+            Weights = (Size * np.maximum(Probabilities, 1e-12)) ** (-self.Beta)
+            Weights = (Weights / Weights.max()).astype(np.float32)
+        return {"States":self.States[Indexes], "Actions":self.Actions[Indexes], "Rewards":self.Rewards[Indexes],
+                "NextStates":self.NextStates[Indexes], "Dones":self.Dones[Indexes], "Indexes":Indexes, "Weights":Weights}
+
+    def UpdatePriorities(self, Indexes, Priorities) -> None:
+        """Sets new priorities (e.g. absolute TD errors) of sampled transitions"""
+        if not self.Prioritized:
+            return
+        Priorities = np.maximum(np.abs(np.asarray(Priorities, dtype=float)), 1e-6)
+        with self.Lock:
+            self._SetPriorities(np.asarray(Indexes), Priorities)
+            self.Header[2] = max(self.Header[2], Priorities.max())
+
+
+def SimulationStep(Sim: Simulation, Config: DesignConfiguration, Action, RewardFunction, **Kwargs):
+    """One step of the Simulation-based loop: writes the Action vars, runs and returns (NextState, Reward, Result)
+
+    The State is [TOP, BOT] Maximum % flooding as in outputs_states; RewardFunction maps the result Dictionary
+    of BLK_RADFRAC_EVALUATE_DESIGN to the reward. Kwargs (FailureMap, Fidelity) go to the evaluation.
+    """
+    Result = Config.Evaluate(Sim, Action, **Kwargs)
+    NextState = np.array([Result["TopMaxFlooding"], Result["BotMaxFlooding"]], dtype=np.float32)
+    return NextState, float(RewardFunction(Result)), Result
+
+
+def RunEngineWorkers(SimulationFactory, Config: DesignConfiguration, Buffer: SharedReplayBuffer, Policy, RewardFunction,
+                     StepsPerWorker: int, NumberOfWorkers: int = 2, EpisodeLength: int = 1, Seed: int = 0) -> list:
+    """Runs several engine workers in threads, each stepping its own Simulation and appending to the one Buffer
+
+    Every episode starts from the State (TOP and BOT Maximum % flooding) of the loaded design after Config.Setup().
+
+    Args:
+        SimulationFactory: Callable returning a new, loaded Simulation, called inside each worker thread
+        Config: DesignConfiguration defining the Action vars
+        Buffer: SharedReplayBuffer receiving the transitions of all workers
+        Policy: Callable (State, Rng) -> Action, e.g. the current SAC actor
+        RewardFunction: Callable of the result Dictionary of a step
+        StepsPerWorker: Steps each worker takes
+        EpisodeLength: Steps per episode, Done is set on the last one
+        Seed: Base seed of the per-worker random generators
+    Returns:
+        List with the exception of each worker, None for workers that finished
+    """
+    Errors = [None] * NumberOfWorkers
+
+    def Work(Worker: int) -> None:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        Rng = np.random.default_rng(Seed + Worker)
+        Sim = None
+        try:
+            Sim = SimulationFactory()
+            Config.Setup(Sim)
+            # Every episode starts from the state of the loaded design
+            Sim.Run()
+            InitialState = np.array([Sim.BLK_RADFRAC_Get_TOP_Max_Flooding(Config.Blockname),
+                                     Sim.BLK_RADFRAC_Get_BOT_Max_Flooding(Config.Blockname)], dtype=np.float32)
+            State = InitialState
+            for Step in range(StepsPerWorker):
+                Action = np.asarray(Policy(State, Rng), dtype=np.float32)
+                NextState, Reward, Result = SimulationStep(Sim, Config, Action, RewardFunction)
+                Done = (Step + 1) % EpisodeLength == 0
+                Buffer.Add(State, Action, Reward, NextState, Done)
+                State = InitialState if Done else NextState
+        except Exception as Error:
+            Errors[Worker] = Error
+        finally:
+            # A failed worker must not leave its Aspen engine running
+            if Sim is not None:
+                try:
+                    Sim.CloseAspen()
+                except Exception as Error:
+                    if Errors[Worker] is None:
+                        Errors[Worker] = Error
+
+    Threads = [threading.Thread(target=Work, args=(Worker,), daemon=True) for Worker in range(NumberOfWorkers)]
+    for Thread in Threads:
+        Thread.start()
+    for Thread in Threads:
+        Thread.join()
+    return Errors
+
+
+
+
+###########################################################################################################################################
+#####
+############# Bulk reader of stream results and block duties for purity- and duty-based rewards ##########
+#####
+###########################################################################################################################################
+
+# Stream result fields -> Output node path below the stream (MIXED substream)
+STREAM_RESULT_PATHS = {
+    "MoleFlow": ("MOLEFLMX", "MIXED"),
+    "MassFlow": ("MASSFLMX", "MIXED"),
+    "Temperature": ("TEMP_OUT", "MIXED"),
+    "Pressure": ("PRES_OUT", "MIXED"),
+}
+
+# Block result fields -> Output node of the RadFrac Block
+BLOCK_DUTY_PATHS = {
+    "CondenserDuty": ("COND_DUTY",),
+    "ReboilerDuty": ("REB_DUTY",),
+}
+
+
+class StreamResultsReader():
+    """Reads stream results (component mole fractions, flows, temperature, pressure) and block duties in bulk
+
+    The COM nodes of all requested values are resolved once and kept, so every Read() is a single pass of .Value
+    reads over the kept handles. The handles are resolved again if the Simulation got a new Aspen document (e.g.
+    recycled by EngineSupervisor), and a Read() without a run or an input change since the last one is served from
+    the previous arrays. Values Aspen does not provide are NaN.
+
+    Args:
+        Sim: Simulation (or EngineSupervisor) with the archive loaded
+        Streamnames: Names of the material streams
+        Blocknames: Names of the RadFrac Blocks whose condenser/reboiler duties are read
+        Components: Component ids of the mole fractions, defaults to those listed by the first stream
+    """
+
+    def __init__(self, Sim: Simulation, Streamnames, Blocknames = (), Components = None):
+        self.Sim = Sim
+        self.Streamnames = list(Streamnames)
+        self.Blocknames = list(Blocknames)
+        self.Components = list(Components) if Components is not None else None
+        self._Document = None
+        self._StreamNodes = None        # rows of node handles, one row per stream
+        self._BlockNodes = None         # rows of node handles, one row per block
+        self._Generation = None
+        self._Last = None
+
+    @staticmethod
+    def _Resolve(Node, Path):
+        try:
+            for Name in Path:
+                Node = Node.Elements(Name)
+            return Node
+        except Exception:
+            return None
+
+    def _ResolveNodes(self) -> None:
+        STRM = self.Sim.STRM
+        if self.Components is None:
+            Node = self._Resolve(STRM.Elements(self.Streamnames[0]), ("Output", "MOLEFRAC", "MIXED"))
+            self.Components = [Component.Name for Component in Node.Elements] if Node is not None else []
+        self._StreamNodes = []
+        for Streamname in self.Streamnames:
+            Output = self._Resolve(STRM, (Streamname, "Output"))
+            Row = [self._Resolve(Output, Path) if Output is not None else None for Path in STREAM_RESULT_PATHS.values()]
+            Row += [self._Resolve(Output, ("MOLEFRAC", "MIXED", Component)) if Output is not None else None
+                    for Component in self.Components]
+            self._StreamNodes.append(Row)
+        self._BlockNodes = [[self._Resolve(self.Sim.BLK, (Blockname, "Output") + Path) for Path in BLOCK_DUTY_PATHS.values()]
+                            for Blockname in self.Blocknames]
+        self._Document = self.Sim.AspenSimulation
+
+    @staticmethod
+    def _NameType(Names) -> str:
+        # Sized to the longest name, a fixed width would cut long names and break the lookups by name
+        return f"U{max([len(Name) for Name in Names] + [1])}"
+
+    @property
+    def StreamDType(self) -> np.dtype:
+        return np.dtype([("Stream", self._NameType(self.Streamnames))] + [(Field, "f8") for Field in STREAM_RESULT_PATHS]
+                        + [("x_" + Component, "f8") for Component in self.Components])
+
+    @property
+    def BlockDType(self) -> np.dtype:
+        return np.dtype([("Block", self._NameType(self.Blocknames))] + [(Field, "f8") for Field in BLOCK_DUTY_PATHS])
+
+    @staticmethod
+    def _Values(Row) -> tuple:
+        Values = []
+        for Node in Row:
+            Value = Node.Value if Node is not None else None
+            Values.append(np.nan if Value is None else float(Value))
+        return tuple(Values)
+
+    def Read(self) -> Dict[str, np.ndarray]:
+        """Returns {"Streams": structured array, one row per stream, "Blocks": structured array, one row per block}"""
+        if self._StreamNodes is None or self._Document is not self.Sim.AspenSimulation:
+            self._ResolveNodes()
+            self._Last = None
+        Generation = (self.Sim.RunGeneration, self.Sim.InputGeneration)
+        if self._Last is not None and Generation == self._Generation:
+            return self._Last
+        Streams = np.array([(Streamname,) + self._Values(Row) for Streamname, Row in zip(self.Streamnames, self._StreamNodes)],
+                           dtype=self.StreamDType)
+        Blocks = np.array([(Blockname,) + self._Values(Row) for Blockname, Row in zip(self.Blocknames, self._BlockNodes)],
+                          dtype=self.BlockDType)
+        self._Last = {"Streams":Streams, "Blocks":Blocks}
+        self._Generation = Generation
+        return self._Last
+
+    def Purity(self, Streamname: str, Component: str) -> float:
+        """Mole fraction of a component in a stream, from the last (or a new) Read()"""
+        Streams = self.Read()["Streams"]
+        return float(Streams["x_" + Component][self.Streamnames.index(Streamname)])
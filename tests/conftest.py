@@ -0,0 +1,14 @@
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+@pytest.fixture
+def MockSimulation(tmp_path):
+    """Factory of quiet Simulations on a MockAspenDocument (or the given document), with a placeholder archive"""
+    (tmp_path / "Mock.bkp").write_bytes(b"archive")
+
+    def Make(Document = None, **Kwargs):
+        Document = Document if Document is not None else L.MockAspenDocument()
+        return L.Simulation("Mock.bkp", str(tmp_path), False, ChangeDirectory=False, AspenDocument=Document, QUIET=True, **Kwargs)
+    return Make
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_fixed_diameter_actions_leave_out_the_diameters():
+    Config = L.DesignConfiguration.FixedColumnDiameter("B1", 2.0, 2.0)
+    assert Config.ActionDimension == len(L.RADFRAC_INTERNALS_INPUTS) - 2
+    assert "ColDiam_Top" not in Config.ActionNames and "ColDiam_Bot" not in Config.ActionNames
+    Action = np.arange(1, Config.ActionDimension + 1) / 10
+    Design = Config.ActionToDesign(Action)
+    assert list(Design) == Config.ActionNames
+    assert np.allclose(Config.DesignToAction(Design), Action)
+    Full = Config.FullDesign(Action)
+    assert set(Full) == set(L.RADFRAC_INTERNALS_INPUTS)
+    assert Full["ColDiam_Top"] == Full["ColDiam_Bot"] == 2.0
+    with pytest.raises(ValueError):
+        Config.ActionToDesign(Action[:-1])
+
+
+def test_invalid_configurations_are_rejected():
+    with pytest.raises(ValueError):
+        L.DesignConfiguration("B1", {"NotAnInput": 1.0})
+    with pytest.raises(ValueError):
+        L.DesignConfiguration("B1", {"ColDiam_Top": 1.0}, ActionNames=["ColDiam_Top"])
+
+
+def test_frozen_inputs_survive_the_next_seed(MockSimulation, tmp_path):
+    # MockSimulation has written the placeholder archive into tmp_path
+    Manager = L.AspenEngineManager(["B1"], DocumentFactory=L.MockAspenDocument, QUIET=True)
+    Config = L.DesignConfiguration.FixedColumnDiameter("B1", 2.0, 2.0)
+    Sim = Manager.Acquire("Mock.bkp", str(tmp_path))
+    Config.Setup(Sim)
+    Config.Apply(Sim, np.full(Config.ActionDimension, 0.07))
+    assert Manager.Acquire("Mock.bkp", str(tmp_path)) is Sim
+    Inputs = Sim.BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK("B1")
+    assert Inputs["ColDiam_Top"] == Inputs["ColDiam_Bot"] == 2.0
+    assert Inputs["TraySpace_Top"] == L.MockAspenDocument.DefaultInputs["CA_TRAY_SPC"]
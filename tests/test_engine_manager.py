@@ -0,0 +1,38 @@
+import CodeLibrary_dlbf_v3 as L
+
+
+def _Calls(Document, Method):
+    return sum(1 for Event in Document.Events if Event[0] == "C" and Event[1] == Method)
+
+
+def test_next_seed_resets_instead_of_reloading(MockSimulation, tmp_path):
+    # MockSimulation has written the placeholder archive into tmp_path
+    Documents = []
+
+    def DocumentFactory():
+        Documents.append(L.RecordingAspenDocument(L.MockAspenDocument()))
+        return Documents[-1]
+
+    Manager = L.AspenEngineManager(["B1"], DocumentFactory=DocumentFactory, QUIET=True)
+    Sim = Manager.Acquire("Mock.bkp", str(tmp_path))
+    Sim.BLK_RADFRAC_EVALUATE_DESIGN("B1", {"ColDiam_Top": 2.2, "WeirHeight_Bot": 0.07}, Fidelity="low")
+    assert Manager.Acquire("Mock.bkp", str(tmp_path)) is Sim
+    assert len(Documents) == 1
+    assert _Calls(Documents[0], "InitFromArchive2") == 1
+    assert _Calls(Documents[0], "Reinit") == 1
+    assert Sim.BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK("B1") == Sim.BaselineInputs["B1"]
+    assert Sim.BaselineInputs["B1"]["ColDiam_Top"] == L.MockAspenDocument.DefaultInputs["CA_DIAM"]
+    assert Sim.Fidelity == {"B1": "high"}
+    assert Sim.OutputSnapshot is None
+
+
+def test_workers_get_their_own_engines(MockSimulation, tmp_path):
+    Manager = L.AspenEngineManager(["B1"], DocumentFactory=L.MockAspenDocument, QUIET=True)
+    First = Manager.Acquire("Mock.bkp", str(tmp_path), Worker=0)
+    Second = Manager.Acquire("Mock.bkp", str(tmp_path), Worker=1)
+    assert First is not Second
+    Manager.Release(Worker=0)
+    assert list(Manager.Engines) == [(1, str(tmp_path / "Mock.bkp"))]
+    assert Manager.Acquire("Mock.bkp", str(tmp_path), Worker=0) is not First
+    Manager.CloseAll()
+    assert Manager.Engines == {}
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+@pytest.fixture
+def Pool(MockSimulation):
+    Sim = MockSimulation()
+    Pool = L.SimulationEnginePool(MockSimulation, "B1", NumberOfEngines=2, BaseDesign=Sim.BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK("B1"))
+    yield Pool
+    Pool.Close()
+
+
+def test_partial_designs_need_a_base_design(MockSimulation):
+    Pool = L.SimulationEnginePool(MockSimulation, "B1", NumberOfEngines=1)
+    try:
+        with pytest.raises(ValueError):
+            Pool.EvaluateBatch([{"ColDiam_Top": 2.0, "ColDiam_Bot": 2.0}])
+    finally:
+        Pool.Close()
+
+
+def test_jacobian_matches_the_mock_correlation(Pool):
+    # Mock maximum % flooding = 1.1 * 80 * (1.5 / D) ** 2 * (WeirHeight / 0.0508) ** 0.1 at the other defaults
+    Sensitivity = L.DesignSensitivity(Pool, {"ColDiam_Top": 1.5, "WeirHeight_Bot": 0.0508})
+    assert Sensitivity["Variables"] == ["ColDiam_Top", "WeirHeight_Bot"]
+    Expected = np.array([[-2 * 88.0 / 1.5, 0.0],
+                         [0.0, 0.1 * 88.0 / 0.0508]])
+    assert Sensitivity["Jacobian"] == pytest.approx(Expected, rel=1e-3, abs=1e-6)
+
+
+def test_refinement_stays_within_the_bounds(Pool):
+    # The unbounded optimum (80 % flooding) is at a diameter of 1.57, above the upper bounds
+    Lower = {"ColDiam_Top": 1.2, "ColDiam_Bot": 1.2}
+    Upper = {"ColDiam_Top": 1.45, "ColDiam_Bot": 1.45}
+    Refined = L.RefineDesign(Pool, {"ColDiam_Top": 1.45, "ColDiam_Bot": 1.2}, Lower, Upper, Iterations=8, Radius=0.5)
+    for Name in Lower:
+        assert Lower[Name] <= Refined["Design"][Name] <= Upper[Name]
+    assert Refined["History"] == sorted(Refined["History"], reverse=True)
+    assert Refined["Objective"] < Refined["History"][0]
+    assert Refined["Design"]["ColDiam_Top"] == 1.45
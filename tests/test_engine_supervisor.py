@@ -0,0 +1,51 @@
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_memory_is_checked_per_engine(MockSimulation):
+    # Only the engine whose own memory is over the limit is recycled
+    MemoryMB = {}
+    Supervisors = [L.EngineSupervisor(MockSimulation, ["B1"], MaxRuns=None, MaxMemoryMB=1000.0,
+                                      MemoryFunction=lambda Sim: MemoryMB.get(id(Sim.AspenSimulation), 0.0), MemoryCheckInterval=1)
+                   for _ in range(2)]
+    MemoryMB[id(Supervisors[0].Sim.AspenSimulation)] = 1500.0
+    MemoryMB[id(Supervisors[1].Sim.AspenSimulation)] = 500.0
+    for Supervisor in Supervisors:
+        for _ in range(3):
+            Supervisor.Run()
+    assert [len(Supervisor.Recycles) for Supervisor in Supervisors] == [1, 0]
+    assert Supervisors[0].Recycles == [(1, "memory")]
+
+
+def test_passed_in_documents_have_no_known_engine(MockSimulation):
+    assert L.AspenEngineMemoryMB(MockSimulation()) is None
+
+
+def test_recycle_keeps_the_settings(MockSimulation):
+    Supervisor = L.EngineSupervisor(MockSimulation, ["B1"], MaxRuns=2)
+    Metrics = L.SimulationMetrics()
+    Supervisor.Metrics = Metrics
+    Supervisor.QUIET = True
+    for _ in range(5):
+        Supervisor.Run()
+    assert len(Supervisor.Recycles) == 2
+    assert Supervisor.Sim.Metrics is Metrics
+    assert Metrics.Summary()["Runs"] == 5
+
+
+def test_failed_restart_keeps_the_old_engine(MockSimulation):
+    Starts = []
+
+    def Factory():
+        Starts.append(1)
+        if len(Starts) > 1:
+            raise OSError("no license available")
+        return MockSimulation()
+
+    Supervisor = L.EngineSupervisor(Factory, ["B1"], MaxRuns=1)
+    Supervisor.Metrics = L.SimulationMetrics()
+    Old = Supervisor.Sim
+    Supervisor.BLK_RADFRAC_EVALUATE_DESIGN("B1", {"ColDiam_Top": 1.8, "ColDiam_Bot": 1.8})
+    Result = Supervisor.BLK_RADFRAC_EVALUATE_DESIGN("B1", {"ColDiam_Top": 2.0, "ColDiam_Bot": 2.0})
+    assert Supervisor.Sim is Old
+    assert Result["Converged"] and Supervisor.Recycles == []
+    assert Supervisor.Metrics.Summary()["Runs"] == 2
@@ -0,0 +1,55 @@
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+def _Design(**Changes):
+    return dict(L.RADFRAC_INTERNALS_SCALE, **Changes)
+
+
+def test_two_nearby_failures_skip_a_candidate():
+    Map = L.FailureMap()
+    Map.Record(_Design(), False)
+    assert Map.FailureProbability(_Design()) == pytest.approx(0.5)
+    assert not Map.ShouldSkip(_Design())
+    Map.Record(_Design(ColDiam_Top=1.51), False)
+    assert Map.ShouldSkip(_Design(ColDiam_Top=1.505))
+    # Converged designs around it outweigh the failures again
+    for _ in range(3):
+        Map.Record(_Design(), True)
+    assert not Map.ShouldSkip(_Design())
+
+
+def test_neighbourhood_is_relative_to_each_variable():
+    Map = L.FailureMap()
+    for _ in range(2):
+        Map.Record(_Design(), False)
+    # The same 2 cm are 1 % of the diameter but 40 % of the weir height
+    assert Map.ShouldSkip(_Design(ColDiam_Bot=1.52))
+    assert Map.FailureProbability(_Design(WeirHeight_Bot=0.0708)) == 0.0
+
+
+def test_episode_reports_count_skips_and_failures():
+    Map = L.FailureMap(AttemptsPerFailure=2)
+    for Index in range(100):
+        Map.Record(_Design(ColDiam_Top=1.0 + 0.5 * Index), Index % 10 != 0)
+    assert len(Map.Failed) == 100 and Map.Points.shape == (100, len(L.RADFRAC_INTERNALS_INPUTS))
+    Map.Record(_Design(ColDiam_Top=1.0), False)
+    assert Map.ShouldSkip(_Design(ColDiam_Top=1.0))
+    assert not Map.ShouldSkip(_Design(ColDiam_Top=1.5))
+    Report = Map.EndEpisode()
+    assert Report == {"Episode":0, "SkippedCandidates":1, "AvoidedFailingRuns":2, "RecordedFailures":11,
+                      "KnownFailures":11, "KnownDesigns":101}
+    assert Map.EndEpisode()["SkippedCandidates"] == 0
+
+
+def test_skipped_designs_are_not_run(MockSimulation):
+    Sim = MockSimulation()
+    Map = L.FailureMap()
+    Bad = {"ColDiam_Top": -1.0}
+    for _ in range(2):
+        assert not Sim.BLK_RADFRAC_EVALUATE_DESIGN("B1", Bad, Map)["Converged"]
+    RunCount = Sim.AspenSimulation.RunCount
+    Result = Sim.BLK_RADFRAC_EVALUATE_DESIGN("B1", Bad, Map)
+    assert Result["Skipped"] and Result["TopMaxFlooding"] == Map.Penalty
+    assert Sim.AspenSimulation.RunCount == RunCount
@@ -0,0 +1,36 @@
+import math
+
+import CodeLibrary_dlbf_v3 as L
+
+
+def _MAXOL(Sim):
+    return Sim.AspenSimulation.Tree.Elements("Data").Elements("Blocks").Elements("B1").Elements("Input").Elements("MAXOL").Value
+
+
+def test_failed_screenings_do_not_block_promotion(MockSimulation):
+    Scheduler = L.FidelityScheduler(MockSimulation(), "B1", WarmupCandidates=2)
+    Scheduler.ScreeningObjectives = [2.0] + [math.inf] * 5
+    assert Scheduler.Promote({"Converged":True, "TopMaxFlooding":80.0, "BotMaxFlooding":80.0, "Fidelity":"low"})
+    Result = Scheduler.Evaluate({"ColDiam_Top": 1.5, "ColDiam_Bot": 1.5})
+    assert [Record["Fidelity"] for Record in Scheduler.Records][-1] == Result["Fidelity"]
+
+
+def test_recycle_keeps_the_fidelity(MockSimulation):
+    Supervisor = L.EngineSupervisor(MockSimulation, ["B1"], MaxRuns=None)
+    Supervisor.SetFidelity("B1", "low")
+    Supervisor.Recycle()
+    assert Supervisor.Fidelity == {"B1": "low"}
+    assert _MAXOL(Supervisor.Sim) == L.RADFRAC_FIDELITY_INPUTS["low"]["MAXOL"]
+    Supervisor.SetFidelity("B1", "high")
+    assert _MAXOL(Supervisor.Sim) == 25
+
+
+def test_screening_does_not_outlive_the_evaluation(MockSimulation):
+    Sim = MockSimulation()
+    Scheduler = L.FidelityScheduler(Sim, "B1", WarmupCandidates=0, PromoteQuantile=0.0)
+    Scheduler.Evaluate({"ColDiam_Top": 1.5, "ColDiam_Bot": 1.5})
+    Scheduler.Evaluate({"ColDiam_Top": 3.0, "ColDiam_Bot": 3.0})
+    assert Scheduler.Records[-1]["Fidelity"] == "low"
+    assert Sim.Fidelity == {"B1": "high"}
+    assert _MAXOL(Sim) == 25
+    assert Sim.BLK_RADFRAC_EVALUATE_DESIGN("B1", {"ColDiam_Top": 1.5, "ColDiam_Bot": 1.5})["Fidelity"] == "high"
@@ -0,0 +1,22 @@
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_cache_hit_rates_are_per_cache(MockSimulation):
+    Metrics = L.SimulationMetrics()
+    Sim = MockSimulation(Metrics=Metrics)
+    Sim.Run()
+    Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1")
+    # Without a registered Block there is no snapshot cache to miss
+    assert Metrics.Summary()["CacheHitRates"] == {}
+
+    Sim.RegisterSnapshotBlock("B1")
+    Sim.Run()
+    Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1")
+    Sim.BLK_RADFRAC_Get_BOT_Max_Flooding("B1")
+    Sim.BLK_RADFRAC_EVALUATE_DESIGN("B1", {"ColDiam_Top": 1.5, "ColDiam_Bot": 1.5}, L.FailureMap())
+    Rates = Metrics.Summary()["CacheHitRates"]
+    assert Rates["snapshot"] == 1.0
+    assert Rates["failuremap"] == 0.0
+    Text = Metrics.PrometheusText()
+    assert 'aspen_cache_hit_rate{cache="snapshot"} 1.0' in Text
+    assert Text.count("# TYPE aspen_cache_hit_rate gauge") == 1
@@ -0,0 +1,43 @@
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+def _SetTopStages(Sim, Value):
+    # Behind the API, as a run the Simulation does not know about would
+    for Stage in Sim.BLK.Elements("B1").Elements("Output").Elements("CA_FLD_FAC8").Elements("INT-1").Elements("TOP").Elements:
+        Stage.Value = Value
+
+
+@pytest.fixture
+def Sim(MockSimulation):
+    Sim = MockSimulation(Metrics=L.SimulationMetrics())
+    Sim.RegisterSnapshotBlock("B1")
+    Sim.Run()
+    return Sim
+
+
+def test_getters_are_served_from_the_snapshot(Sim):
+    Flooding = Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1")
+    _SetTopStages(Sim, 50.0)
+    assert Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1") == Flooding
+    assert Sim.Metrics.Summary()["CacheHitRates"]["snapshot"] == 1.0
+
+
+def test_setter_invalidates_the_snapshot(Sim):
+    _SetTopStages(Sim, 50.0)
+    Sim.BLK_RADFRAC_SET_ALL_INPUTS("B1", {"ColDiam_Bot": 1.7})
+    assert Sim.OutputSnapshot is None
+    assert Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1") == 50.0
+
+
+@pytest.mark.parametrize("Invalidate", [lambda Sim: Sim.SetFidelity("B1", "low"), lambda Sim: Sim.EngineReinit(),
+                                        lambda Sim: Sim.EngineRun()], ids=["SetFidelity", "EngineReinit", "EngineRun"])
+def test_engine_changes_invalidate_the_snapshot(Sim, Invalidate):
+    Reader = L.StreamResultsReader(Sim, ["DIST"], ["B1"])
+    Before = Reader.Read()
+    Invalidate(Sim)
+    assert Sim.OutputSnapshot is None
+    assert Reader.Read() is not Before
+    _SetTopStages(Sim, 50.0)
+    assert Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1") == 50.0
@@ -0,0 +1,29 @@
+import gzip
+import json
+
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_recorded_writes_round_trip(MockSimulation, tmp_path):
+    Recorder = L.RecordingAspenDocument(L.MockAspenDocument())
+    Sim = MockSimulation(Recorder)
+    Design = {"ColDiam_Top": 1.7, "ColDiam_Bot": 2.1}
+    Recorded = Sim.BLK_RADFRAC_EVALUATE_DESIGN("B1", Design)
+    Node = Recorder.Tree.Elements("Data").Elements("Blocks").Elements("B1").Elements("Input").Elements("CA_DIAM").Elements("INT-1").Elements("TOP")
+    Node.UnitString = "meter"
+    TracePath = str(tmp_path / "session.trace.gz")
+    Recorder.SaveTrace(TracePath)
+
+    with gzip.open(TracePath, "rt", encoding="utf-8") as TraceFile:
+        Events = [json.loads(Line) for Line in TraceFile]
+    assert ["S", "Data/Blocks/B1/Input/CA_DIAM/INT-1/TOP", 1.7] in Events
+    assert ["N", "Data/Blocks/B1/Input/CA_DIAM/INT-1/TOP", "UnitString", "meter"] in Events
+
+    Replay = L.ReplayAspenDocument(TracePath)
+    Replayed = MockSimulation(Replay).BLK_RADFRAC_EVALUATE_DESIGN("B1", Design)
+    assert Replay.Stats["Writes"] >= 2
+    assert Replayed["TopMaxFlooding"] == pytest.approx(Recorded["TopMaxFlooding"])
+    assert Replayed["BotMaxFlooding"] == pytest.approx(Recorded["BotMaxFlooding"])
+    assert Replay.Tree.Elements("Data").Elements("Blocks").Elements("B1").Elements("Input").Elements("CA_DIAM").Elements("INT-1").Elements("TOP").UnitString == "meter"
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_prioritized_sampling_follows_priorities():
+    Buffer = L.SharedReplayBuffer(5, 2, 1, Prioritized=True, Alpha=0.6)
+    for Index in range(5):
+        Buffer.Add([Index, Index], [0.0], 0.0, [Index, Index], False)
+    Priorities = np.array([1.0, 2.0, 4.0, 8.0, 0.5])
+    Buffer.UpdatePriorities(np.arange(5), Priorities)
+    Rng = np.random.default_rng(0)
+    Counts = np.zeros(5)
+    for _ in range(2000):
+        Counts += np.bincount(Buffer.Sample(32, Rng)["Indexes"], minlength=5)
+    Expected = Priorities ** 0.6 / (Priorities ** 0.6).sum()
+    assert Counts / Counts.sum() == pytest.approx(Expected, abs=0.01)
+
+
+def test_failed_worker_closes_its_engine(MockSimulation):
+    Closed = []
+
+    def Factory():
+        Sim = MockSimulation()
+        Sim.CloseAspen = lambda: Closed.append(Sim)
+        return Sim
+
+    def Policy(State, Rng):
+        raise RuntimeError("policy failed")
+
+    Config = L.DesignConfiguration("B1")
+    Buffer = L.SharedReplayBuffer(8, 2, Config.ActionDimension)
+    Errors = L.RunEngineWorkers(Factory, Config, Buffer, Policy, lambda Result: 0.0, StepsPerWorker=2, NumberOfWorkers=2)
+    assert all(isinstance(Error, RuntimeError) for Error in Errors)
+    assert len(Closed) == 2
+
+
+def test_episodes_start_from_the_loaded_design(MockSimulation):
+    Config = L.DesignConfiguration.FixedColumnDiameter("B1", 1.5, 1.5)
+    Buffer = L.SharedReplayBuffer(16, 2, Config.ActionDimension)
+    Baseline = MockSimulation().BLK_RADFRAC_GET_ME_ALL_INPUTS_BACK("B1")
+    Action = Config.DesignToAction(Baseline)
+    Errors = L.RunEngineWorkers(MockSimulation, Config, Buffer, lambda State, Rng: Action, lambda Result: 0.0,
+                                StepsPerWorker=4, NumberOfWorkers=2, EpisodeLength=2)
+    assert Errors == [None, None]
+    # The Action keeps the loaded design, so every State is its flooding, also at the start of an episode
+    assert len(Buffer) == 8
+    assert np.allclose(Buffer.States[:8], 88.0)
+    assert np.allclose(Buffer.NextStates[:8], 88.0)
@@ -0,0 +1,79 @@
+import queue
+import socket
+import threading
+import time
+
+import pytest
+
+import CodeLibrary_dlbf_v3 as L
+
+
+@pytest.fixture
+def Server(MockSimulation):
+    Ready = queue.Queue()
+
+    def Serve():
+        Server = L.SimulationServer(MockSimulation(L.MockAspenDocument(RunDelay=0.01)), "B1")
+        Ready.put(Server)
+        Server.ServeForever(PollInterval=0.05)
+
+    Thread = threading.Thread(target=Serve, daemon=True)
+    Thread.start()
+    Server = Ready.get()
+    yield Server
+    Server.Shutdown()
+    Thread.join()
+
+
+def _Designs(Number):
+    return [{"ColDiam_Top": 1.0 + 0.05 * Index, "ColDiam_Bot": 1.0 + 0.05 * Index} for Index in range(Number)]
+
+
+def test_pool_pipelines_requests(Server, MockSimulation):
+    Pool = L.SimulationClientPool([Server.Address], Depth=3)
+    Client = Pool.Clients[0]
+    InFlight, MaxInFlight = [0], [0]
+    Send, Receive = Client.Send, Client.Receive
+
+    def CountingSend(*Args):
+        InFlight[0] += 1
+        MaxInFlight[0] = max(MaxInFlight[0], InFlight[0])
+        return Send(*Args)
+
+    def CountingReceive():
+        Response = Receive()
+        InFlight[0] -= 1
+        return Response
+
+    Client.Send, Client.Receive = CountingSend, CountingReceive
+    Designs = _Designs(8)
+    Results = Pool.EvaluateBatch(Designs)
+    Pool.Close()
+    assert MaxInFlight[0] == 3
+    for Design, Result in zip(Designs, Results):
+        assert Result["TopMaxFlooding"] == pytest.approx(MockSimulation().BLK_RADFRAC_EVALUATE_DESIGN("B1", Design)["TopMaxFlooding"])
+
+
+def test_pool_finishes_batch_when_a_server_drops(Server, MockSimulation):
+    # Takes the first requests of its connection, then drops it and stops listening: its designs are requeued
+    # after the healthy server has drained the queue
+    Listener = socket.create_server(("127.0.0.1", 0))
+
+    def Drop():
+        Connection, _ = Listener.accept()
+        Connection.recv(1 << 16)
+        time.sleep(0.5)
+        Connection.close()
+        Listener.close()
+
+    Dropper = threading.Thread(target=Drop, daemon=True)
+    Dropper.start()
+    Pool = L.SimulationClientPool([Listener.getsockname()[:2], Server.Address], Depth=2, MaxRetries=2)
+    Designs = _Designs(6)
+    Results = Pool.EvaluateBatch(Designs)
+    Pool.Close()
+    Dropper.join()
+    assert all(Result is not None for Result in Results)
+    for Design, Result in zip(Designs, Results):
+        assert Result["Converged"]
+        assert Result["BotMaxFlooding"] == pytest.approx(MockSimulation().BLK_RADFRAC_EVALUATE_DESIGN("B1", Design)["BotMaxFlooding"])
@@ -0,0 +1,12 @@
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_long_stream_names_are_kept(MockSimulation):
+    Streamnames = ["FEED", "DISTILLATE-PRODUCT-TO-STORAGE-TANK-7", "BOTT"]
+    Document = L.MockAspenDocument(Blocknames=("COLUMN-WITH-A-VERY-LONG-BLOCK-NAME-1",), Streamnames=Streamnames)
+    Sim = MockSimulation(Document)
+    Reader = L.StreamResultsReader(Sim, Streamnames, ["COLUMN-WITH-A-VERY-LONG-BLOCK-NAME-1"])
+    Results = Reader.Read()
+    assert list(Results["Streams"]["Stream"]) == Streamnames
+    assert list(Results["Blocks"]["Block"]) == ["COLUMN-WITH-A-VERY-LONG-BLOCK-NAME-1"]
+    assert Reader.Purity("DISTILLATE-PRODUCT-TO-STORAGE-TANK-7", "BENZENE") == 0.5
@@ -0,0 +1,20 @@
+import CodeLibrary_dlbf_v3 as L
+
+
+def test_index_serves_stage_names_from_cache(MockSimulation):
+    Sim = MockSimulation()
+    Index = Sim.LoadTreeIndex(["B1"])
+    assert Index.StageNames("B1", "TOP") == [str(Stage) for Stage in range(2, 11)]
+    Loaded = L.AspenTreeIndex.LoadOrBuild(None, Sim.AspenFilePath, ["B1"])
+    assert Loaded.Blocks == Index.Blocks
+
+
+def test_block_without_stages_is_not_cached(MockSimulation):
+    Document = L.MockAspenDocument(TopStages=[])
+    Sim = MockSimulation(Document)
+    Index = Sim.LoadTreeIndex(["B1"])
+    assert "B1" not in Index.Blocks
+    # Stages appear once results exist: the readers go to COM instead of an empty cached list
+    TopNode = Document.Tree.Elements("Data").Elements("Blocks").Elements("B1").Elements("Output").Elements("CA_FLD_FAC8").Elements("INT-1").Elements("TOP")
+    TopNode.Add("2", 75.0)
+    assert Sim.BLK_RADFRAC_Get_TOP_Max_Flooding("B1") == 75.0